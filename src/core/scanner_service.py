@@ -57,6 +57,11 @@ class ScannerService:
             self.logger.error(f"Failed to initialize scanner service: {e}")
             raise
     
+    def close(self) -> None:
+        """Release the sockets held by the scanner service"""
+        if self.file_transfer_service:
+            self.file_transfer_service.close()
+    
     def discover_agents(self) -> List[Tuple[ScannerProtocolMessage, str]]:
         """
         Discover available agents on the network.
@@ -3,8 +3,9 @@ Network-related data models and DTOs.
 Follows SRP - Single responsibility for network data structures.
 """
 from abc import ABC, abstractmethod
+from functools import cached_property
 from pydantic import BaseModel, Field, field_validator
-from typing import ClassVar, Protocol
+from typing import ClassVar, Protocol, Union
 from ipaddress import IPv4Address, AddressValueError
 
 
@@ -13,7 +14,12 @@ class ProtocolConstants:
     SIGNATURE: bytes = b'\x55\x00\x00'
     TYPE_OF_REQUEST: bytes = b'\x5a\x00\x00'
     TYPE_OF_FILE_TRANSFER: bytes = b'\x5a\x54\x00'  # New request type for file transfer
+    TYPE_CODE_DISCOVERY: int = 0x00005a  # TYPE_OF_REQUEST read as a little-endian integer
+    TYPE_CODE_FILE_TRANSFER: int = 0x00545a  # TYPE_OF_FILE_TRANSFER read as a little-endian integer
     EXPECTED_MESSAGE_SIZE: int = 90
+    TYPE_OFFSET: int = 3
+    TYPE_SIZE: int = 3
+    SRC_NAME_OFFSET: int = 20
     SRC_NAME_SIZE: int = 20
     DST_NAME_SIZE: int = 40
     RESERVED1_SIZE: int = 6
@@ -31,7 +37,7 @@ class Serializable(Protocol):
 class Deserializable(Protocol):
     """Interface for deserializable objects - ISP: Interface segregation"""
     @classmethod
-    def from_bytes(cls, data: bytes) -> "Deserializable":
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> "Deserializable":
         ...
 
 
@@ -95,6 +101,11 @@ class ScannerProtocolMessage(BaseModel):
     def validate_dst_name(cls, v) -> bytes:
         return FieldValidator.validate_bytes_field(v, ProtocolConstants.DST_NAME_SIZE, "dst_name")
 
+    @cached_property
+    def type_code(self) -> int:
+        """Type of request as a little-endian integer, for single-compare dispatch"""
+        return int.from_bytes(self.type_of_request, 'little')
+
     def to_bytes(self) -> bytes:
         """Serialize message to bytes"""
         from ..network.protocols.scanner_protocol import MessageSerializer
@@ -111,7 +122,7 @@ class ScannerProtocolMessage(BaseModel):
         MessageDebugger.print_debug_info(self)
 
     @classmethod
-    def from_bytes(cls, data: bytes) -> "ScannerProtocolMessage":
-        """Deserialize message from bytes"""
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> "ScannerProtocolMessage":
+        """Deserialize message from bytes or any buffer (e.g. a memoryview over a receive buffer)"""
         from ..network.protocols.scanner_protocol import MessageDeserializer
         return MessageDeserializer.deserialize_message(data)
@@ -0,0 +1,208 @@
+"""
+Batched UDP socket I/O using recvmmsg(2) / sendmmsg(2).
+Follows SRP - Single responsibility for multi-datagram system calls.
+
+Linux only: callers should check is_supported() and fall back to
+recvfrom/sendto on other platforms.
+"""
+import ctypes
+import ctypes.util
+import errno
+import socket
+import sys
+from typing import List, Optional, Tuple
+
+MSG_DONTWAIT = getattr(socket, 'MSG_DONTWAIT', 0x40)
+MSG_WAITFORONE = 0x10000
+MSG_TRUNC = getattr(socket, 'MSG_TRUNC', 0x20)
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [
+        ('iov_base', ctypes.c_void_p),
+        ('iov_len', ctypes.c_size_t),
+    ]
+
+
+class _SockaddrIn(ctypes.Structure):
+    _fields_ = [
+        ('sin_family', ctypes.c_ushort),
+        ('sin_port', ctypes.c_ubyte * 2),   # network byte order
+        ('sin_addr', ctypes.c_ubyte * 4),   # network byte order
+        ('sin_zero', ctypes.c_ubyte * 8),
+    ]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_name', ctypes.c_void_p),
+        ('msg_namelen', ctypes.c_uint32),
+        ('msg_iov', ctypes.POINTER(_IoVec)),
+        ('msg_iovlen', ctypes.c_size_t),
+        ('msg_control', ctypes.c_void_p),
+        ('msg_controllen', ctypes.c_size_t),
+        ('msg_flags', ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_hdr', _MsgHdr),
+        ('msg_len', ctypes.c_uint),
+    ]
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """Load libc if it exposes recvmmsg/sendmmsg, otherwise return None."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint,
+                                  ctypes.c_int, ctypes.c_void_p]
+        libc.recvmmsg.restype = ctypes.c_int
+        libc.sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+        libc.sendmmsg.restype = ctypes.c_int
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_libc()
+
+
+def is_supported() -> bool:
+    """Check whether recvmmsg/sendmmsg are available on this platform."""
+    return _libc is not None
+
+
+def _fill_sockaddr(sa: _SockaddrIn, addr: Tuple[str, int]) -> None:
+    sa.sin_family = socket.AF_INET
+    sa.sin_port[:] = addr[1].to_bytes(2, 'big')
+    sa.sin_addr[:] = socket.inet_aton(addr[0])
+
+
+def _read_sockaddr(sa: _SockaddrIn) -> Tuple[str, int]:
+    return socket.inet_ntoa(bytes(sa.sin_addr)), int.from_bytes(bytes(sa.sin_port), 'big')
+
+
+class DatagramBatch:
+    """
+    Preallocated recvmmsg/sendmmsg state for one IPv4 UDP socket.
+
+    All receive slots live in a single bytearray; recv() returns memoryview
+    slices into it, which stay valid until the next call to recv().
+    Datagrams larger than a slot are dropped and counted in `truncated`.
+    A batch created with buffer_size=0 is send-only and allocates no receive state.
+    """
+
+    def __init__(self, sock: socket.socket, batch_size: int = 32, buffer_size: int = 2048):
+        """
+        Initialize batch buffers.
+
+        Args:
+            sock: Bound AF_INET datagram socket
+            batch_size: Maximum number of datagrams per system call
+            buffer_size: Size of each receive slot in bytes (0 for a send-only batch)
+        """
+        if _libc is None:
+            raise OSError(errno.ENOSYS, "recvmmsg/sendmmsg not available on this platform")
+
+        self._sock = sock
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.truncated = 0
+
+        if buffer_size > 0:
+            self._buffer = bytearray(batch_size * buffer_size)
+            self._view = memoryview(self._buffer)
+            base = ctypes.addressof((ctypes.c_char * len(self._buffer)).from_buffer(self._buffer))
+
+            self._rx_iov = (_IoVec * batch_size)()
+            self._rx_addr = (_SockaddrIn * batch_size)()
+            self._rx_msgs = (_MMsgHdr * batch_size)()
+            for i in range(batch_size):
+                self._rx_iov[i].iov_base = base + i * buffer_size
+                self._rx_iov[i].iov_len = buffer_size
+                hdr = self._rx_msgs[i].msg_hdr
+                hdr.msg_name = ctypes.addressof(self._rx_addr[i])
+                hdr.msg_iov = ctypes.pointer(self._rx_iov[i])
+                hdr.msg_iovlen = 1
+
+        self._tx_iov = (_IoVec * batch_size)()
+        self._tx_addr = (_SockaddrIn * batch_size)()
+        self._tx_msgs = (_MMsgHdr * batch_size)()
+        for i in range(batch_size):
+            hdr = self._tx_msgs[i].msg_hdr
+            hdr.msg_name = ctypes.addressof(self._tx_addr[i])
+            hdr.msg_namelen = ctypes.sizeof(_SockaddrIn)
+            hdr.msg_iov = ctypes.pointer(self._tx_iov[i])
+            hdr.msg_iovlen = 1
+
+    def recv(self, flags: int = MSG_DONTWAIT) -> List[Tuple[memoryview, Tuple[str, int]]]:
+        """
+        Receive up to batch_size datagrams with a single recvmmsg call.
+
+        Args:
+            flags: recvmmsg flags (non-blocking by default)
+
+        Returns:
+            List of (data, (ip, port)) tuples; empty if nothing was queued.
+            Truncated datagrams are left out, so it may be shorter than the
+            number of datagrams consumed.
+        """
+        if self.buffer_size == 0:
+            raise ValueError("recv() called on a send-only DatagramBatch")
+
+        namelen = ctypes.sizeof(_SockaddrIn)
+        for i in range(self.batch_size):
+            self._rx_msgs[i].msg_hdr.msg_namelen = namelen
+
+        count = _libc.recvmmsg(self._sock.fileno(), self._rx_msgs, self.batch_size, flags, None)
+        if count < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return []
+            raise OSError(err, f"recvmmsg failed: {errno.errorcode.get(err, err)}")
+
+        datagrams = []
+        for i in range(count):
+            if self._rx_msgs[i].msg_hdr.msg_flags & MSG_TRUNC:
+                self.truncated += 1
+                continue
+            start = i * self.buffer_size
+            length = self._rx_msgs[i].msg_len
+            datagrams.append((self._view[start:start + length], _read_sockaddr(self._rx_addr[i])))
+        return datagrams
+
+    def send(self, datagrams: List[Tuple[bytes, Tuple[str, int]]]) -> int:
+        """
+        Send datagrams with as few sendmmsg calls as possible.
+
+        Any datagrams the kernel does not accept in a batch are sent
+        individually with sendto.
+
+        Args:
+            datagrams: List of (payload, (ip, port)) tuples
+
+        Returns:
+            Number of datagrams sent
+        """
+        sent = 0
+        for offset in range(0, len(datagrams), self.batch_size):
+            chunk = datagrams[offset:offset + self.batch_size]
+            keepalive = []
+            for i, (payload, addr) in enumerate(chunk):
+                data = ctypes.create_string_buffer(bytes(payload), len(payload))
+                keepalive.append(data)
+                self._tx_iov[i].iov_base = ctypes.addressof(data)
+                self._tx_iov[i].iov_len = len(payload)
+                _fill_sockaddr(self._tx_addr[i], addr)
+
+            count = _libc.sendmmsg(self._sock.fileno(), self._tx_msgs, len(chunk), 0)
+            if count < 0:
+                count = 0
+            for payload, addr in chunk[count:]:
+                self._sock.sendto(payload, addr)
+            sent += len(chunk)
+        return sent
@@ -18,6 +18,10 @@ def get_scanner_protocol_message():
     from ...dto.network_models import ScannerProtocolMessage
     return ScannerProtocolMessage
 
+def get_field_validator():
+    from ...dto.network_models import FieldValidator
+    return FieldValidator
+
 
 class ScannerProtocolMessageBuilder:
     """Builder pattern for ScannerProtocolMessage - SRP: Single responsibility for building messages"""
@@ -151,3 +155,37 @@ class ScannerProtocolMessageBuilder:
             dst_name=self._dst_name,
             reserved3=self._reserved3
         )
+    
+    def build_bytes(self) -> bytes:
+        """
+        Build the final message directly in wire format, skipping the model object.
+        
+        Raises:
+            ValueError: If a fixed-width field has the wrong length or a name is too long
+        """
+        from .scanner_protocol import MessageSerializer
+        ProtocolConstants = get_protocol_constants()
+        FieldValidator = get_field_validator()
+        
+        # The model only checks the names; a wrong-sized fixed field would
+        # silently produce a datagram that receivers drop
+        for field_name, value, size in (
+            ("signature", self._signature, len(ProtocolConstants.SIGNATURE)),
+            ("type_of_request", self._type_of_request, ProtocolConstants.TYPE_SIZE),
+            ("reserved1", self._reserved1, ProtocolConstants.RESERVED1_SIZE),
+            ("reserved2", self._reserved2, ProtocolConstants.RESERVED2_SIZE),
+            ("reserved3", self._reserved3, ProtocolConstants.RESERVED3_SIZE),
+        ):
+            if len(value) != size:
+                raise ValueError(f"{field_name} must be {size} bytes, got {len(value)}")
+        
+        return MessageSerializer.serialize_fields(
+            self._signature,
+            self._type_of_request,
+            self._reserved1,
+            self._initiator_ip,
+            self._reserved2,
+            FieldValidator.validate_bytes_field(self._src_name, ProtocolConstants.SRC_NAME_SIZE, "src_name"),
+            FieldValidator.validate_bytes_field(self._dst_name, ProtocolConstants.DST_NAME_SIZE, "dst_name"),
+            self._reserved3
+        )
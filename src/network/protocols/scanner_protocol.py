@@ -2,8 +2,9 @@
 Scanner protocol implementation.
 Follows SRP - Single responsibility for protocol operations.
 """
+import struct
 from ipaddress import IPv4Address
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Union
 
 if TYPE_CHECKING:
     from ...dto.network_models import ScannerProtocolMessage, ProtocolConstants
@@ -24,45 +25,60 @@ class MessageSerializer:
     @staticmethod
     def serialize_message(message: "ScannerProtocolMessage") -> bytes:
         """Convert message to bytes representation"""
+        return MessageSerializer.serialize_fields(
+            message.signature,
+            message.type_of_request,
+            message.reserved1,
+            message.initiator_ip,
+            message.reserved2,
+            message.src_name,
+            message.dst_name,
+            message.reserved3
+        )
+    
+    @staticmethod
+    def serialize_fields(signature: bytes, type_of_request: bytes, reserved1: bytes,
+                         initiator_ip: IPv4Address, reserved2: bytes, src_name: bytes,
+                         dst_name: bytes, reserved3: bytes) -> bytes:
+        """Convert raw field values to bytes representation without building a message"""
         ProtocolConstants = get_protocol_constants()
         
-        ip_bytes = message.initiator_ip.packed
-        src_bytes = message.src_name.ljust(ProtocolConstants.SRC_NAME_SIZE, b'\x00')
-        dst_bytes = message.dst_name.ljust(ProtocolConstants.DST_NAME_SIZE, b'\x00')
+        ip_bytes = initiator_ip.packed
+        src_bytes = src_name.ljust(ProtocolConstants.SRC_NAME_SIZE, b'\x00')
+        dst_bytes = dst_name.ljust(ProtocolConstants.DST_NAME_SIZE, b'\x00')
         
         return (
-            message.signature +
-            message.type_of_request +
-            message.reserved1 +
+            signature +
+            type_of_request +
+            reserved1 +
             ip_bytes +
-            message.reserved2 +
+            reserved2 +
             src_bytes +
             dst_bytes +
-            message.reserved3
+            reserved3
         )
 
 
 class MessageDeserializer:
     """Handles message deserialization - SRP: Single responsibility for deserialization"""
     
+    # Wire layout: signature, type, reserved1, ip, reserved2, src_name, dst_name, reserved3
+    _LAYOUT = struct.Struct('3s3s6s4s4s20s40s10s')
+    
     @staticmethod
-    def deserialize_message(data: bytes) -> "ScannerProtocolMessage":
-        """Create message from bytes representation"""
+    def deserialize_message(data: Union[bytes, bytearray, memoryview]) -> "ScannerProtocolMessage":
+        """Create message from any buffer-protocol object without copying the whole buffer"""
         ProtocolConstants = get_protocol_constants()
         ScannerProtocolMessage = get_scanner_protocol_message()
         
         if len(data) != ProtocolConstants.EXPECTED_MESSAGE_SIZE:
             raise ValueError(f"Expected {ProtocolConstants.EXPECTED_MESSAGE_SIZE} bytes, got {len(data)}")
 
-        signature = data[0:3]
-        type_of_request = data[3:6]
-        reserved1 = data[6:12]
-        ip_bytes = data[12:16]
+        (signature, type_of_request, reserved1, ip_bytes,
+         reserved2, src_name, dst_name, reserved3) = MessageDeserializer._LAYOUT.unpack_from(data)
         initiator_ip = IPv4Address(ip_bytes)
-        reserved2 = data[16:20]
-        src_name = data[20:40].rstrip(b'\x00')
-        dst_name = data[40:80].rstrip(b'\x00')
-        reserved3 = data[80:90]
+        src_name = src_name.rstrip(b'\x00')
+        dst_name = dst_name.rstrip(b'\x00')
 
         return ScannerProtocolMessage(
             signature=signature,
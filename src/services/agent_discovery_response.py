@@ -3,20 +3,137 @@ Agent discovery response service.
 Follows SRP - Single responsibility for responding to discovery operations.
 This is the counterpart to AgentDiscoveryService - it listens and responds instead of broadcasting and listening.
 """
+import errno
+import fcntl
+import os
+import queue
+import selectors
 import socket
+import struct
 import threading
 import time
 import logging
-from typing import Optional, Callable, Any
+import functools
+from collections import deque
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Callable, Any, Dict, List, Tuple
 from pathlib import Path
-from datetime import datetime
 
 from ..dto.network_models import ScannerProtocolMessage, ProtocolConstants
 from ..network.protocols.message_builder import ScannerProtocolMessageBuilder
+from ..network import mmsg
 from ..utils.config import config
+from ..utils.logging_setup import setup_logging
 from .file_transfer import FileTransferService
 from .raw_converter import RawFileConverter
 
+# Wire constants used on every packet
+_DISCOVERY_TYPE = ProtocolConstants.TYPE_OF_REQUEST         # 5a 00 00
+_FILE_XFER_TYPE = ProtocolConstants.TYPE_OF_FILE_TRANSFER   # 5a 54 00
+_RESERVED1 = b'\x00\x09\xb9\x00\x2c\x84'
+_RESERVED2 = b'\x00\x00\x02\xc4'
+_MESSAGE_SIZE = ProtocolConstants.EXPECTED_MESSAGE_SIZE
+_TYPE_START = ProtocolConstants.TYPE_OFFSET
+_TYPE_END = ProtocolConstants.TYPE_OFFSET + ProtocolConstants.TYPE_SIZE
+
+# Upload receive pipeline: buffers cycle between the socket reader and the disk writer
+_RECV_CHUNK = 65536
+_RECV_BUFFERS = 4
+_SPLICE_CHUNK = 1 << 20
+
+# recvmmsg calls per readiness event while batches keep coming back full
+_UDP_DRAIN_ROUNDS = 8
+
+# SO_LINGER on, zero timeout: close() sends RST
+_LINGER_RESET = struct.pack('ii', 1, 0)
+
+# Client IP -> filename tag
+_DOT_TO_UNDER = str.maketrans('.', '_')
+
+# Parser bound once at import, called for every datagram
+_parse_msg = ScannerProtocolMessage.from_bytes
+
+# recvmsg_into reports MSG_TRUNC for oversize datagrams; recvfrom_into cuts them silently
+_HAS_RECVMSG = hasattr(socket.socket, 'recvmsg_into')
+_MSG_TRUNC = getattr(socket, 'MSG_TRUNC', 0)
+
+
+@functools.lru_cache(maxsize=256)
+def _patch_src_name(template: bytes, src_name: bytes) -> bytes:
+    """
+    Patch a sender's name into a serialized response template.
+    
+    Memoized because a LAN only has a handful of scanners, each beaconing
+    with the same name.
+    
+    Args:
+        template: Serialized response with an empty src_name
+        src_name: Raw src_name field from the request
+        
+    Returns:
+        Serialized response with src_name as its source name
+    """
+    sender_name = src_name.decode('ascii', errors='ignore').encode('ascii')
+    
+    start = ProtocolConstants.SRC_NAME_OFFSET
+    end = start + ProtocolConstants.SRC_NAME_SIZE
+    return template[:start] + sender_name.ljust(ProtocolConstants.SRC_NAME_SIZE, b'\x00') + template[end:]
+
+
+def _convert_raw_worker(raw_filepath: str, output_directory: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Convert a received raw file to JPG or PDF - runs in a conversion worker process.
+    
+    Module-level so that ProcessPoolExecutor can pickle it.
+    
+    Args:
+        raw_filepath: Path to the received raw file
+        output_directory: Directory to write the converted file to
+        
+    Returns:
+        Tuple of (raw file analysis, converted file path)
+    """
+    raw_path = Path(raw_filepath)
+    converter = RawFileConverter()
+    
+    # Analyze the raw file to determine the appropriate format
+    analysis = converter.analyze_raw_file(raw_path)
+    
+    # Determine output format based on file analysis
+    # Default to JPG for most scans, PDF for specific formats
+    if analysis.get('format_type') == 'pdf':
+        output_format = 'pdf'
+        extension = '.pdf'
+    else:
+        # Use JPG for images (grayscale, color, B&W)
+        output_format = 'jpg'
+        extension = '.jpg'
+    
+    # Generate output filename (remove .raw extension, add new extension)
+    output_filepath = Path(output_directory) / f"{raw_path.stem}{extension}"
+    
+    # Convert the file
+    if output_format == 'pdf':
+        result_path = converter.convert_to_pdf(raw_path, output_filepath)
+    else:
+        result_path = converter.convert_to_jpg(raw_path, output_filepath, quality=95)
+    
+    return analysis, str(result_path)
+
+
+def _init_convert_worker(parent_config: Dict[str, Any]) -> None:
+    """
+    Conversion worker initializer: load the parent's configuration and set up logging.
+    
+    Module-level so that ProcessPoolExecutor can pickle it.
+    
+    Args:
+        parent_config: Configuration loaded by the parent process
+    """
+    config._config_cache = parent_config
+    setup_logging()
+
 
 class AgentDiscoveryResponseService:
     """Service for responding to discovery broadcasts from scanners and handling file transfers."""
@@ -36,6 +153,8 @@ class AgentDiscoveryResponseService:
         self.agent_name = agent_name or config.get('scanner.default_src_name', 'Agent')
         self.files_directory = config.get('scanner.files_directory', 'received_files')
         self.max_files_retention = config.get('scanner.max_files_retention', 10)
+        self._retained_files: Optional[deque] = None  # Received .raw files, oldest first
+        self._retention_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
         
         # Proxy configuration
@@ -46,16 +165,55 @@ class AgentDiscoveryResponseService:
         self._file_transfer_service = None
         if self.proxy_enabled and self.proxy_agent_ip:
             self._file_transfer_service = FileTransferService(local_ip=local_ip, port=port, tcp_port=self.tcp_port)
-            self.logger.info(f"Proxy mode enabled - will forward files to {self.proxy_agent_ip}")
+            self.logger.info("Proxy mode enabled - will forward files to %s", self.proxy_agent_ip)
         
-        # UDP socket for discovery/file transfer requests
+        # UDP sockets for discovery/file transfer requests (one per listener thread)
         self._udp_socket: Optional[socket.socket] = None
+        self._udp_sockets: List[socket.socket] = []
         self._running = False
-        self._udp_thread: Optional[threading.Thread] = None
+        self._udp_threads: List[threading.Thread] = []  # Extra SO_REUSEPORT listeners
+        
+        # Per-listener state: the socket being served and its queued sendmmsg replies
+        self._udp_local = threading.local()
+        
+        # Packet-path settings, refreshed in start()
+        self._udp_bufsize = config.get('network.buffer_size', 1024)
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        self._udp_batches: List[Optional[mmsg.DatagramBatch]] = []
+        # Oversize datagrams dropped by the recvmsg path, per socket so that each
+        # counter is only written by the thread serving that socket
+        self._udp_truncated: Dict[socket.socket, int] = {}
         
         # TCP server for file transfers
         self._tcp_socket: Optional[socket.socket] = None
-        self._tcp_thread: Optional[threading.Thread] = None
+        
+        # Single selector thread serving the TCP listener and the first UDP socket
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._io_thread: Optional[threading.Thread] = None
+        self._transfer_pool: Optional[ThreadPoolExecutor] = None
+        self._rx_pool: queue.SimpleQueue = queue.SimpleQueue()  # Reusable upload receive buffers
+        self._convert_pool: Optional[ProcessPoolExecutor] = None
+        self._transfer_slots: Optional[threading.BoundedSemaphore] = None  # Running + queued transfers
+        
+        # Directory fd for files_directory; uploads are created relative to it
+        self._dir_fd: Optional[int] = None
+        
+        # Self-pipe used by stop() to wake the I/O threads
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+        
+        # Response builder reused for every reply (only the UDP listener thread builds responses)
+        self._builder = ScannerProtocolMessageBuilder()
+        
+        # Responses only differ in src_name, so serialize them once and patch that field per packet
+        self._discovery_template = self._build_response_template(_DISCOVERY_TYPE)
+        self._file_transfer_template = self._build_response_template(_FILE_XFER_TYPE)
+        
+        # Request type -> (handler, log description), so dispatch is one dict lookup
+        self._type_dispatch = {
+            _DISCOVERY_TYPE: (self._handle_discovery_message, "discovery message"),
+            _FILE_XFER_TYPE: (self._handle_file_transfer_request, "file transfer request"),
+        }
         
         # Callbacks
         self._discovery_callback: Optional[Callable[[ScannerProtocolMessage, str], Any]] = None
@@ -94,31 +252,94 @@ class AgentDiscoveryResponseService:
             return True
         
         try:
-            # Setup UDP socket for discovery and file transfer requests
-            self._udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self._udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self._udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
-            self._udp_socket.bind(('0.0.0.0', self.port))  # Listen on all interfaces
-            self._udp_socket.settimeout(1.0)  # Set timeout for clean shutdown
+            # Setup UDP sockets for discovery and file transfer requests
+            self._udp_bufsize = config.get('network.buffer_size', 1024)
+            self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)  # Logging is configured by now
+            udp_workers = max(1, config.get('network.udp_workers', 1))
+            if udp_workers > 1 and not hasattr(socket, 'SO_REUSEPORT'):
+                self.logger.warning("SO_REUSEPORT not available - using a single UDP listener")
+                udp_workers = 1
+            for _ in range(udp_workers):
+                self._udp_sockets.append(self._open_udp_socket(reuse_port=udp_workers > 1))
+            self._udp_socket = self._udp_sockets[0]
 
             # Setup TCP socket for file transfers
             self._tcp_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self._tcp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._set_socket_buffers(self._tcp_socket, "TCP")  # Inherited by accepted sockets
+            self._tcp_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self._tcp_socket.bind((self.local_ip, self.tcp_port))
-            self._tcp_socket.listen(5)
-            self._tcp_socket.settimeout(1.0)  # Set timeout for clean shutdown
+            self._tcp_socket.listen(min(config.get('network.tcp_backlog', 128), socket.SOMAXCONN))
+            self._tcp_socket.setblocking(False)  # Accepted sockets are still blocking
+
+            # Open the files directory once so each upload skips the path lookup
+            if hasattr(os, 'O_DIRECTORY') and os.open in os.supports_dir_fd:
+                self._dir_fd = os.open(self.files_directory, os.O_DIRECTORY | os.O_RDONLY)
+
+            # Track files left by previous runs before any upload is queued for conversion
+            self._cleanup_old_files()
+
+            # I/O threads block in select() on their sockets and this pipe; stop() writes to it
+            self._wake_r, self._wake_w = os.pipe()
+            os.set_blocking(self._wake_r, False)
+
+            # Bounded worker pool for file transfers instead of a thread per connection
+            max_transfer_workers = config.get('network.max_transfer_workers', 16)
+            self._transfer_pool = ThreadPoolExecutor(
+                max_workers=max_transfer_workers,
+                thread_name_prefix='xfer'
+            )
+            
+            # Cap accepted-but-unfinished connections so a connect flood cannot queue without bound
+            self._transfer_slots = threading.BoundedSemaphore(
+                max_transfer_workers + config.get('network.max_queued_transfers', 16)
+            )
+
+            # Raw file conversion is CPU-bound: run it in worker processes, outside the GIL.
+            # Workers are started from a clean forkserver/spawn process, never forked from this
+            # multi-threaded one.
+            if not (self.proxy_enabled and self.proxy_agent_ip):
+                start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._convert_pool = ProcessPoolExecutor(
+                    max_workers=config.get('scanner.convert_workers', None) or os.cpu_count(),
+                    mp_context=multiprocessing.get_context(start_method),
+                    initializer=_init_convert_worker,
+                    initargs=(config.load_config(),)
+                )
+
+            # Batch datagram I/O (recvmmsg/sendmmsg) where the platform supports it
+            self._udp_truncated = {udp_socket: 0 for udp_socket in self._udp_sockets}
+            self._udp_batches = batches = []
+            for udp_socket in self._udp_sockets:
+                batch = None
+                if mmsg.is_supported():
+                    batch = mmsg.DatagramBatch(
+                        udp_socket,
+                        batch_size=config.get('network.udp_batch_size', 32),
+                        buffer_size=self._udp_bufsize
+                    )
+                batches.append(batch)
+
+            # One selector multiplexes the TCP listener, the first UDP socket and the wake pipe
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self._udp_socket, selectors.EVENT_READ,
+                                    functools.partial(self._udp_ready, self._udp_socket, batches[0]))
+            self._selector.register(self._tcp_socket, selectors.EVENT_READ, self._tcp_ready)
+            self._selector.register(self._wake_r, selectors.EVENT_READ, None)
 
             self._running = True
             
-            # Start UDP listener thread
-            self._udp_thread = threading.Thread(target=self._udp_listen_loop, daemon=True)
-            self._udp_thread.start()
+            # Start the I/O thread
+            self._io_thread = threading.Thread(target=self._io_loop, daemon=True)
+            self._io_thread.start()
             
-            # Start TCP listener thread  
-            self._tcp_thread = threading.Thread(target=self._tcp_listen_loop, daemon=True)
-            self._tcp_thread.start()
+            # Additional SO_REUSEPORT sockets get their own listener threads
+            for udp_socket, batch in zip(self._udp_sockets[1:], batches[1:]):
+                thread = threading.Thread(target=self._udp_listen_loop, args=(udp_socket, batch), daemon=True)
+                thread.start()
+                self._udp_threads.append(thread)
 
-            self.logger.info(f"Discovery response service started on UDP port {self.port} and TCP port {self.tcp_port}")
+            self.logger.info("Discovery response service started on UDP port %d and TCP port %d", self.port, self.tcp_port)
             return True
             
         except Exception as e:
@@ -126,6 +347,46 @@ class AgentDiscoveryResponseService:
             self._cleanup()
             return False
     
+    def _open_udp_socket(self, reuse_port: bool = False) -> socket.socket:
+        """
+        Create and bind a UDP socket on the discovery port.
+        
+        Args:
+            reuse_port: Set SO_REUSEPORT so several sockets can share the port
+            
+        Returns:
+            Bound UDP socket
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if reuse_port:
+                # The kernel hashes unicast datagrams across the sockets in the group
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            self._set_socket_buffers(sock, "UDP")
+            sock.bind(('0.0.0.0', self.port))  # Listen on all interfaces
+        except Exception:
+            sock.close()
+            raise
+        return sock
+    
+    def _set_socket_buffers(self, sock: socket.socket, label: str) -> None:
+        """
+        Apply configured kernel send/receive buffer sizes to a socket.
+        
+        Args:
+            sock: Socket to configure
+            label: Socket description for logging
+        """
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, config.get('network.so_rcvbuf', 12582912))
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, config.get('network.so_sndbuf', 12582912))
+        
+        # The kernel doubles the requested size and clamps it to net.core.rmem_max/wmem_max
+        self.logger.info("%s socket buffers: rcvbuf=%d sndbuf=%d bytes", label,
+                         sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF),
+                         sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF))
+    
     def stop(self) -> None:
         """Stop the discovery response service."""
         if not self._running:
@@ -134,12 +395,39 @@ class AgentDiscoveryResponseService:
         self.logger.info("Stopping discovery response service...")
         self._running = False
         
+        # Wake the I/O threads immediately instead of waiting for a poll timeout
+        try:
+            os.write(self._wake_w, b'x')
+        except OSError:
+            pass
+        
         # Wait for threads to finish
-        if self._udp_thread and self._udp_thread.is_alive():
-            self._udp_thread.join(timeout=5.0)
-            
-        if self._tcp_thread and self._tcp_thread.is_alive():
-            self._tcp_thread.join(timeout=5.0)
+        if self._io_thread and self._io_thread.is_alive():
+            self._io_thread.join(timeout=5.0)
+        
+        for thread in self._udp_threads:
+            if thread.is_alive():
+                thread.join(timeout=5.0)
+        self._udp_threads = []
+        
+        truncated = sum(self._udp_truncated.values()) + sum(batch.truncated for batch in self._udp_batches if batch)
+        if truncated:
+            self.logger.info("Dropped %d oversize datagrams", truncated)
+        self._udp_batches = []
+        
+        # Let in-flight file transfers finish
+        if self._transfer_pool:
+            self._transfer_pool.shutdown(wait=True)
+            self._transfer_pool = None
+        
+        # Forwarding is done: release the proxy's request sockets
+        if self._file_transfer_service:
+            self._file_transfer_service.close()
+        
+        # ... and the conversions they queued
+        if self._convert_pool:
+            self._convert_pool.shutdown(wait=True)
+            self._convert_pool = None
         
         self._cleanup()
         self.logger.info("Discovery response service stopped")
@@ -150,12 +438,17 @@ class AgentDiscoveryResponseService:
     
     def _cleanup(self) -> None:
         """Clean up resources."""
-        try:
-            if self._udp_socket:
-                self._udp_socket.close()
-                self._udp_socket = None
-        except Exception:
-            pass
+        if self._selector:
+            self._selector.close()
+            self._selector = None
+        
+        for udp_socket in self._udp_sockets:
+            try:
+                udp_socket.close()
+            except Exception:
+                pass
+        self._udp_sockets = []
+        self._udp_socket = None
             
         try:
             if self._tcp_socket:
@@ -163,99 +456,220 @@ class AgentDiscoveryResponseService:
                 self._tcp_socket = None
         except Exception:
             pass
-            
-        # Legacy cleanup for backward compatibility
-        if hasattr(self, '_socket') and self._socket:
+        
+        if self._transfer_pool:
+            self._transfer_pool.shutdown(wait=False)
+            self._transfer_pool = None
+        
+        if self._convert_pool:
+            self._convert_pool.shutdown(wait=False)
+            self._convert_pool = None
+        
+        if self._dir_fd is not None:
             try:
-                self._socket.close()
-            except Exception:
+                os.close(self._dir_fd)
+            except OSError:
                 pass
-            self._socket = None
+            self._dir_fd = None
+        
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._wake_r = self._wake_w = None
     
-    def _udp_listen_loop(self) -> None:
-        """UDP listening loop - runs in separate thread."""
-        self.logger.info(f"Starting UDP listener on port {self.port}")
+    def _io_loop(self) -> None:
+        """
+        Selector loop serving the TCP listener and the first UDP socket - runs in separate thread.
+        
+        Each registered key carries the callback that handles its readiness.
+        """
+        self.logger.info("Starting I/O loop on UDP port %d and TCP %s:%d", self.port, self.local_ip, self.tcp_port)
+        self._pin_udp_listener()
         
         while self._running:
-            try:
-                data, addr = self._udp_socket.recvfrom(config.get('network.buffer_size', 1024))
-                self.logger.debug(f"Received {len(data)} bytes from {addr[0]}:{addr[1]}")
-                
-                # Process the received message
-                self._handle_udp_message(data, addr)
-                
-            except socket.timeout:
-                # Timeout is expected for clean shutdown
-                continue
-            except Exception as e:
-                if self._running:  # Only log if we're supposed to be running
-                    self.logger.error(f"Error in UDP listener: {e}")
+            events = self._selector.select()
+            if any(key.data is None for key, _ in events):
+                break  # stop() wrote to the wake pipe
+            for key, _ in events:
+                key.data()
+        
+        self.logger.info("I/O loop stopped")
+
+    def _udp_listen_loop(self, udp_socket: Optional[socket.socket] = None,
+                         batch: Optional[mmsg.DatagramBatch] = None) -> None:
+        """
+        Dedicated loop for an additional SO_REUSEPORT socket - runs in separate thread.
+        
+        Args:
+            udp_socket: Socket to serve (defaults to the first UDP socket)
+            batch: recvmmsg/sendmmsg state for udp_socket, or None to use recvfrom
+        """
+        udp_socket = udp_socket or self._udp_socket
+        self.logger.info("Starting UDP listener on port %d", self.port)
+        self._pin_udp_listener()
+        
+        # Block until a datagram arrives or stop() writes to the wake pipe.
+        # The pipe is never drained so that all loops observe it.
+        with selectors.DefaultSelector() as selector:
+            selector.register(udp_socket, selectors.EVENT_READ, udp_socket)
+            selector.register(self._wake_r, selectors.EVENT_READ, None)
+            
+            while self._running:
+                events = selector.select()
+                if any(key.data is None for key, _ in events):
+                    break
+                self._udp_ready(udp_socket, batch)
         
         self.logger.info("UDP listener stopped")
 
-    def _tcp_listen_loop(self) -> None:
-        """TCP listening loop for file transfers - runs in separate thread."""
-        self.logger.info(f"Starting TCP listener on {self.local_ip}:{self.tcp_port}")
+    def _udp_ready(self, udp_socket: socket.socket, batch: Optional[mmsg.DatagramBatch]) -> None:
+        """
+        Receive and handle the datagrams queued on a readable UDP socket.
         
-        while self._running:
-            try:
-                client_socket, client_addr = self._tcp_socket.accept()
-                self.logger.info(f"TCP connection accepted from {client_addr[0]}:{client_addr[1]}")
+        Args:
+            udp_socket: Readable UDP socket
+            batch: recvmmsg/sendmmsg state for udp_socket, or None to use recvfrom
+        """
+        # Responses go out on the socket the request arrived on
+        local = self._udp_local
+        local.socket = udp_socket
+        local.pending = None  # Replies are only queued for sendmmsg on the batch path
+        try:
+            for _ in range(_UDP_DRAIN_ROUNDS):
+                if batch is not None:
+                    # Drain queued datagrams, up to a batch per recvmmsg call
+                    datagrams = batch.recv()
+                    local.pending = []
+                else:
+                    # Receive into this thread's reusable buffer instead of a new bytes object
+                    view = getattr(local, 'recv_view', None)
+                    if view is None:
+                        view = local.recv_view = memoryview(bytearray(self._udp_bufsize))
+                    if _HAS_RECVMSG:
+                        received, _, msg_flags, addr = udp_socket.recvmsg_into([view])
+                        if msg_flags & _MSG_TRUNC:
+                            # Larger than any protocol message: drop before touching the payload
+                            self._udp_truncated[udp_socket] += 1
+                            break
+                    else:
+                        received, addr = udp_socket.recvfrom_into(view)
+                    datagrams = [(view[:received], addr)]
                 
-                # Handle file transfer in a separate thread
-                transfer_thread = threading.Thread(
-                    target=self._handle_file_transfer,
-                    args=(client_socket, client_addr),
-                    daemon=True
-                )
-                transfer_thread.start()
+                for data, addr in datagrams:
+                    if self._debug_enabled:
+                        self.logger.debug("Received %d bytes from %s:%d", len(data), addr[0], addr[1])
+                    
+                    # Process the received message
+                    self._handle_udp_message(data, addr)
                 
-            except socket.timeout:
-                # Timeout is expected for clean shutdown
-                continue
-            except Exception as e:
-                if self._running:
-                    self.logger.error(f"Error in TCP listener: {e}")
+                # Flush responses queued while handling the batch with a single sendmmsg call
+                if local.pending:
+                    batch.send(local.pending)
+                
+                # A full batch means more may be queued: receive again without
+                # another select() round trip (bounded so TCP accepts are not starved)
+                if batch is None or len(datagrams) < batch.batch_size:
+                    break
+            
+        except Exception as e:
+            if self._running:  # Only log if we're supposed to be running
+                self.logger.error(f"Error in UDP listener: {e}")
+        finally:
+            local.pending = None
+
+    def _tcp_ready(self) -> None:
+        """Accept a pending file transfer connection and hand it to the worker pool."""
+        try:
+            client_socket, client_addr = self._tcp_socket.accept()
+        except BlockingIOError:
+            return  # Connection went away between select() and accept()
+        except Exception as e:
+            if self._running:
+                self.logger.error(f"Error in TCP listener: {e}")
+            return
+        
+        if not self._transfer_slots.acquire(blocking=False):
+            # Reset rather than close gracefully so rejected connections leave no TIME_WAIT
+            self.logger.warning(f"Too many file transfers in progress, rejecting {client_addr[0]}:{client_addr[1]}")
+            try:
+                client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+            except OSError:
+                pass
+            client_socket.close()
+            return
         
-        self.logger.info("TCP listener stopped")
+        self.logger.info("TCP connection accepted from %s:%d", client_addr[0], client_addr[1])
+        
+        # Handle file transfer on the worker pool
+        self._transfer_pool.submit(self._run_transfer, client_socket, client_addr)
+
+    def _run_transfer(self, client_socket: socket.socket, client_addr: tuple) -> None:
+        """
+        Worker pool entry point: handle one file transfer, then free its slot.
+        
+        Args:
+            client_socket: TCP socket connected to client
+            client_addr: Client address tuple (ip, port)
+        """
+        try:
+            self._handle_file_transfer(client_socket, client_addr)
+        finally:
+            self._transfer_slots.release()
+
+    def _pin_udp_listener(self) -> None:
+        """
+        Pin the calling (UDP listener) thread to the configured CPU.
+        
+        Keeping the listener on the core that services the NIC's RX interrupts
+        avoids cross-core cache misses per datagram. Operators should pin the RX
+        queue IRQ to the same core via /proc/irq/<n>/smp_affinity.
+        """
+        cpu = config.get('network.udp_cpu_affinity', None)
+        if cpu is None or not hasattr(os, 'sched_setaffinity'):
+            return
+        
+        try:
+            os.sched_setaffinity(0, {cpu})  # 0 = calling thread on Linux
+            self.logger.info("UDP listener pinned to CPU %d", cpu)
+        except OSError as e:
+            self.logger.warning(f"Failed to pin UDP listener to CPU {cpu}: {e}")
 
-    # Legacy method name for backward compatibility
-    def _listen_loop(self) -> None:
-        """Legacy method - delegates to UDP listener."""
-        self._udp_listen_loop()
-    
     def _handle_udp_message(self, data: bytes, addr: tuple) -> None:
         """
         Handle incoming UDP message (discovery or file transfer request).
         
         Args:
-            data: Raw message data
+            data: Raw message data (bytes or a memoryview into the receive buffer)
             addr: Sender address tuple (ip, port)
         """
+        # Check size and message type on the raw bytes so that unrelated broadcast
+        # traffic (mDNS, SSDP, ...) is dropped without a full parse
+        if len(data) != _MESSAGE_SIZE:
+            if self._debug_enabled:
+                self.logger.debug("Ignoring %d-byte datagram from %s:%d", len(data), addr[0], addr[1])
+            return
+        
+        request_type = bytes(data[_TYPE_START:_TYPE_END])
+        dispatch = self._type_dispatch.get(request_type)
+        if dispatch is None:
+            self.logger.warning(f"Unknown message type: {request_type.hex()} from {addr[0]}:{addr[1]}")
+            return
+        
+        handler, description = dispatch
+        self.logger.info("Received %s from %s:%d", description, addr[0], addr[1])
+        
         try:
-            # Try to parse the message
-            message = ScannerProtocolMessage.from_bytes(data)
-            sender_address = f"{addr[0]}:{addr[1]}"
-            
-            self.logger.debug(f"Message type: {message.type_of_request.hex()}")
-            
-            # Check message type
-            if message.type_of_request == bytes.fromhex('5A0000'):
-                # Discovery request
-                self.logger.info(f"Received discovery message from {sender_address}")
-                self._handle_discovery_message(message, addr)
-                
-            elif message.type_of_request == bytes.fromhex('5A5400'):
-                # File transfer request
-                self.logger.info(f"Received file transfer request from {sender_address}")
-                self._handle_file_transfer_request(message, addr)
-                
-            else:
-                self.logger.warning(f"Unknown message type: {message.type_of_request.hex()} from {sender_address}")
-                
+            message = _parse_msg(data)
         except Exception as e:
             self.logger.error(f"Error parsing message from {addr[0]}:{addr[1]}: {e}")
-            self.logger.debug(f"Raw data: {data.hex()}")
+            if self._debug_enabled:
+                self.logger.debug("Raw data: %s", bytes(data).hex())
+            return
+        
+        handler(message, addr)
 
     def _handle_discovery_message(self, message: ScannerProtocolMessage, addr: tuple) -> None:
         """
@@ -266,26 +680,21 @@ class AgentDiscoveryResponseService:
             addr: Sender address tuple (ip, port)
         """
         try:
-            sender_address = f"{addr[0]}:{addr[1]}"
+            # The type was already matched by _handle_udp_message
+            response_bytes = self._build_discovery_response(message, addr[0])
             
-            # Check if this is a discovery request
-            if self._is_discovery_request(message):
-                response_message = self._build_discovery_response(message, addr[0])
-                
-                # Call custom callback if set
-                if self._discovery_callback:
-                    try:
-                        callback_result = self._discovery_callback(message, sender_address)
-                        if callback_result is not None:
-                            # Callback can modify the response or provide additional data
-                            self.logger.debug(f"Discovery callback returned: {callback_result}")
-                    except Exception as e:
-                        self.logger.error(f"Error in discovery callback: {e}")
-                
-                # Send response back to sender
-                self._send_response(response_message, addr)
-            else:
-                self.logger.debug(f"Ignoring non-discovery message from {sender_address}")
+            # Call custom callback if set
+            if self._discovery_callback:
+                try:
+                    callback_result = self._discovery_callback(message, f"{addr[0]}:{addr[1]}")
+                    if callback_result is not None:
+                        # Callback can modify the response or provide additional data
+                        self.logger.debug("Discovery callback returned: %s", callback_result)
+                except Exception as e:
+                    self.logger.error(f"Error in discovery callback: {e}")
+            
+            # Send response back to sender
+            self._send_response(response_bytes, addr)
                 
         except Exception as e:
             self.logger.error(f"Failed to handle discovery message from {addr}: {e}")
@@ -299,23 +708,21 @@ class AgentDiscoveryResponseService:
             addr: Sender address tuple (ip, port)
         """
         try:
-            sender_address = f"{addr[0]}:{addr[1]}"
-            
             # Build and send UDP response to acknowledge file transfer request
-            response_message = self._build_file_transfer_response(message, addr[0])
-            self._send_response(response_message, addr)
+            response_bytes = self._build_file_transfer_response(message, addr[0])
+            self._send_response(response_bytes, addr)
             
             # Call custom callback if set
             if self._file_transfer_callback:
                 try:
-                    callback_result = self._file_transfer_callback(message, sender_address)
+                    callback_result = self._file_transfer_callback(message, f"{addr[0]}:{addr[1]}")
                     if callback_result is not None:
-                        self.logger.debug(f"File transfer callback returned: {callback_result}")
+                        self.logger.debug("File transfer callback returned: %s", callback_result)
                 except Exception as e:
                     self.logger.error(f"Error in file transfer callback: {e}")
             
             # Log file transfer initiation
-            self.logger.info(f"File transfer request acknowledged for {sender_address}")
+            self.logger.info("File transfer request acknowledged for %s:%d", addr[0], addr[1])
             
         except Exception as e:
             self.logger.error(f"Failed to handle file transfer request from {addr}: {e}")
@@ -329,36 +736,35 @@ class AgentDiscoveryResponseService:
             client_addr: Client address tuple (ip, port)
         """
         try:
+            # Disable Nagle and delayed ACKs so the scanner's writes are acknowledged promptly
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if hasattr(socket, 'TCP_QUICKACK'):
+                client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            
             sender_address = f"{client_addr[0]}:{client_addr[1]}"
-            self.logger.info(f"Starting file transfer from {sender_address}")
+            self.logger.info("Starting file transfer from %s", sender_address)
             
             # Generate unique filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"received_file_{timestamp}_{client_addr[0].replace('.', '_')}.raw"
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            filename = f"received_file_{timestamp}_{client_addr[0].translate(_DOT_TO_UNDER)}.raw"
             filepath = Path(self.files_directory) / filename
             
-            # Receive file data
-            total_bytes = 0
-            with open(filepath, 'wb') as f:
-                while True:
-                    data = client_socket.recv(8192)  # 8KB chunks
-                    if not data:
-                        break
-                    f.write(data)
-                    total_bytes += len(data)
+            # Receive file data until the scanner closes the connection
+            total_bytes = self._receive_to_file(client_socket, filepath)
             
-            self.logger.info(f"File transfer completed: {filename} ({total_bytes} bytes)")
-            
-            # Clean up old files to maintain retention limit
-            self._cleanup_old_files()
+            self.logger.info("File transfer completed: %s (%d bytes)", filename, total_bytes)
             
             # Proxy mode: automatically forward the received file to the configured agent
             if self.proxy_enabled and self.proxy_agent_ip and self._file_transfer_service:
-                self.logger.info(f"Proxy mode: forwarding received file to {self.proxy_agent_ip}")
+                self.logger.info("Proxy mode: forwarding received file to %s", self.proxy_agent_ip)
                 self._forward_file_to_agent(filepath)
+                self._drop_from_page_cache(filepath)
+                
+                # Clean up old files to maintain retention limit
+                self._cleanup_old_files(filepath)
             else:
                 # Agent mode: convert raw file and save to files directory
-                self.logger.info(f"Agent mode: converting raw file to standard format")
+                self.logger.info("Agent mode: converting raw file to standard format")
                 self._convert_and_save_raw_file(filepath)
             
         except Exception as e:
@@ -369,6 +775,154 @@ class AgentDiscoveryResponseService:
             except Exception:
                 pass
     
+    def _receive_to_file(self, client_socket: socket.socket, filepath: Path) -> int:
+        """
+        Receive a file from a socket until the peer closes the connection.
+        
+        Uses the zero-copy splice path on Linux and the buffered path elsewhere,
+        or when the kernel refuses to splice into the files directory.
+        
+        Args:
+            client_socket: TCP socket connected to client
+            filepath: Destination file path
+            
+        Returns:
+            Number of bytes received
+        """
+        if hasattr(os, 'splice'):
+            total_bytes = self._splice_to_file(client_socket, filepath)
+            if total_bytes is not None:
+                return total_bytes
+        return self._copy_to_file(client_socket, filepath)
+    
+    def _create_upload_file(self, filepath: Path) -> int:
+        """
+        Create (or truncate) an upload file for writing.
+        
+        Args:
+            filepath: Destination file path inside files_directory
+            
+        Returns:
+            Writable file descriptor
+        """
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        if self._dir_fd is not None:
+            return os.open(filepath.name, flags, 0o644, dir_fd=self._dir_fd)
+        return os.open(filepath, flags, 0o644)
+    
+    def _splice_to_file(self, client_socket: socket.socket, filepath: Path) -> Optional[int]:
+        """
+        Move a file from a socket to disk through a pipe with splice(2).
+        
+        Data stays in the kernel; it is never copied into Python buffers.
+        
+        Args:
+            client_socket: TCP socket connected to client
+            filepath: Destination file path
+            
+        Returns:
+            Number of bytes received, or None if splice is unsupported before any data moved
+        """
+        pipe_r, pipe_w = os.pipe()
+        fd = self._create_upload_file(filepath)
+        total_bytes = 0
+        try:
+            # A larger pipe lets each splice move more than the default 64KB
+            try:
+                fcntl.fcntl(pipe_w, fcntl.F_SETPIPE_SZ, _SPLICE_CHUNK)
+            except (AttributeError, OSError):
+                pass
+            
+            sock_fd = client_socket.fileno()
+            while True:
+                try:
+                    received = os.splice(sock_fd, pipe_w, _SPLICE_CHUNK, flags=os.SPLICE_F_MOVE)
+                except OSError as e:
+                    if total_bytes == 0 and e.errno in (errno.EINVAL, errno.ENOSYS):
+                        return None
+                    raise
+                if not received:
+                    break
+                
+                pending = received
+                while pending:
+                    pending -= os.splice(pipe_r, fd, pending, flags=os.SPLICE_F_MOVE)
+                total_bytes += received
+        finally:
+            os.close(fd)
+            os.close(pipe_r)
+            os.close(pipe_w)
+        return total_bytes
+    
+    def _copy_to_file(self, client_socket: socket.socket, filepath: Path) -> int:
+        """
+        Receive a file from a socket, overlapping network reads with disk writes.
+        
+        The calling thread fills preallocated buffers with recv_into and hands them
+        to a writer thread, which returns each buffer once it is written to disk.
+        
+        Args:
+            client_socket: TCP socket connected to client
+            filepath: Destination file path
+            
+        Returns:
+            Number of bytes received
+        """
+        # Open the file first so a failed open cannot leak borrowed buffers
+        fd = self._create_upload_file(filepath)
+        
+        # Borrow buffers from the service-wide pool (allocating only when it runs dry)
+        buffers = []
+        for _ in range(_RECV_BUFFERS):
+            try:
+                buffers.append(self._rx_pool.get_nowait())
+            except queue.Empty:
+                buffers.append(bytearray(_RECV_CHUNK))
+        
+        free_buffers: queue.Queue = queue.Queue()
+        for buffer in buffers:
+            free_buffers.put(buffer)
+        filled_buffers: queue.Queue = queue.Queue()
+        write_errors = []
+        
+        def write_loop() -> None:
+            try:
+                with os.fdopen(fd, 'wb', buffering=1024 * 1024) as f:
+                    while True:
+                        item = filled_buffers.get()
+                        if item is None:
+                            break
+                        buffer, length = item
+                        f.write(memoryview(buffer)[:length])
+                        free_buffers.put(buffer)
+            except Exception as e:
+                write_errors.append(e)
+                free_buffers.put(None)  # Stop the reader
+        
+        writer = threading.Thread(target=write_loop, daemon=True)
+        writer.start()
+        
+        total_bytes = 0
+        try:
+            while True:
+                buffer = free_buffers.get()
+                if buffer is None:
+                    break
+                received = client_socket.recv_into(buffer)
+                if not received:
+                    break
+                filled_buffers.put((buffer, received))
+                total_bytes += received
+        finally:
+            filled_buffers.put(None)
+            writer.join()
+            for buffer in buffers:
+                self._rx_pool.put(buffer)
+        
+        if write_errors:
+            raise write_errors[0]
+        return total_bytes
+    
     def _is_discovery_request(self, message: ScannerProtocolMessage) -> bool:
         """
         Check if the message is a discovery request.
@@ -380,35 +934,55 @@ class AgentDiscoveryResponseService:
             True if this is a discovery request
         """
         # Discovery requests have type 0x5A 0x00 0x00
-        return message.type_of_request == b'\x5a\x00\x00'
+        return message.type_code == ProtocolConstants.TYPE_CODE_DISCOVERY
     
-    def _build_discovery_response(self, original_message: ScannerProtocolMessage, sender_ip: str) -> ScannerProtocolMessage:
+    def _build_response_template(self, type_of_request: bytes) -> bytes:
         """
-        Build a response message to the discovery request.
+        Serialize a response with an empty src_name, to be patched per request.
         
         Args:
-            original_message: The original discovery message received
-            sender_ip: IP address of the sender
+            type_of_request: Response type (discovery or file transfer signature)
             
         Returns:
-            Response message to send back
+            Serialized response template
         """
-        builder = ScannerProtocolMessageBuilder()
+        return (self._builder.reset()
+                .with_type_of_request(type_of_request)
+                .with_reserved1(_RESERVED1)
+                .with_initiator_ip(self.local_ip)
+                .with_reserved2(_RESERVED2)
+                .with_src_name(b"")
+                .with_dst_name(self.agent_name)
+                .build_bytes())
+    
+    def _render_response(self, template: bytes, original_message: ScannerProtocolMessage) -> bytes:
+        """
+        Patch the sender's name into a serialized response template.
         
+        Args:
+            template: Serialized response from _build_response_template
+            original_message: The original message received
+            
+        Returns:
+            Serialized response with the sender's name as src_name
+        """
         # Use sender's name from the original request as source name
-        sender_name = original_message.src_name.decode('ascii', errors='ignore')
+        return _patch_src_name(template, original_message.src_name)
+    
+    def _build_discovery_response(self, original_message: ScannerProtocolMessage, sender_ip: str) -> bytes:
+        """
+        Build a response message to the discovery request.
         
-        # Build response with sender's name as src and our agent name as dst
-        return (builder.reset()
-                .with_discovery_request()
-                .with_reserved1(bytes.fromhex('0009b9002c84'))  # Set specific reserved1 value
-                .with_initiator_ip(self.local_ip)
-                .with_reserved2(bytes.fromhex('000002c4'))      # Set specific reserved2 value
-                .with_src_name(sender_name)
-                .with_dst_name(self.agent_name)
-                .build())
+        Args:
+            original_message: The original discovery message received
+            sender_ip: IP address of the sender
+            
+        Returns:
+            Serialized response to send back (sender's name as src, our agent name as dst)
+        """
+        return self._render_response(self._discovery_template, original_message)
 
-    def _build_file_transfer_response(self, original_message: ScannerProtocolMessage, sender_ip: str) -> ScannerProtocolMessage:
+    def _build_file_transfer_response(self, original_message: ScannerProtocolMessage, sender_ip: str) -> bytes:
         """
         Build a response message to the file transfer request.
         
@@ -417,38 +991,30 @@ class AgentDiscoveryResponseService:
             sender_ip: IP address of the sender
             
         Returns:
-            Response message to send back (same signature as file transfer request)
+            Serialized response to send back (same signature as file transfer request)
         """
-        builder = ScannerProtocolMessageBuilder()
-        
-        # Use sender's name from the original request as source name
-        sender_name = original_message.src_name.decode('ascii', errors='ignore')
-        
-        # Build response with same signature as file transfer request (0x5A5400)
-        # This acknowledges the file transfer request and indicates we're ready to receive
-        return (builder.reset()
-                .with_file_transfer_request()  # Use file transfer signature 0x5A5400
-                .with_reserved1(bytes.fromhex('0009b9002c84'))  # Set specific reserved1 value
-                .with_initiator_ip(self.local_ip)
-                .with_reserved2(bytes.fromhex('000002c4'))      # Set specific reserved2 value
-                .with_src_name(sender_name)
-                .with_dst_name(self.agent_name)
-                .build())
+        # The response reuses the file transfer signature (0x5A5400) to acknowledge
+        # the request and indicate we're ready to receive
+        return self._render_response(self._file_transfer_template, original_message)
     
-    def _send_response(self, response_message: ScannerProtocolMessage, addr: tuple) -> None:
+    def _send_response(self, response_bytes: bytes, addr: tuple) -> None:
         """
         Send response message back to the sender.
         
         Args:
-            response_message: Message to send
+            response_bytes: Serialized message to send
             addr: Address tuple (ip, port) to send to
         """
         try:
-            response_bytes = response_message.to_bytes()
-            self._udp_socket.sendto(response_bytes, addr)
+            pending = getattr(self._udp_local, 'pending', None)
+            if pending is not None:
+                # Inside a recvmmsg batch - the listener flushes these with sendmmsg
+                pending.append((response_bytes, addr))
+            else:
+                udp_socket = getattr(self._udp_local, 'socket', None) or self._udp_socket
+                udp_socket.sendto(response_bytes, addr)
             
-            self.logger.info(f"Sent UDP response ({len(response_bytes)} bytes) to {addr[0]}:{addr[1]}")
-            self.logger.debug(f"Response type: {response_message.type_of_request.hex()}")
+            self.logger.info("Sent UDP response (%d bytes) to %s:%d", len(response_bytes), addr[0], addr[1])
             
         except Exception as e:
             self.logger.error(f"Failed to send UDP response to {addr}: {e}")
@@ -462,13 +1028,13 @@ class AgentDiscoveryResponseService:
             file_path: Path to the file to forward
         """
         try:
-            self.logger.info(f"Starting proxy file transfer to {self.proxy_agent_ip}")
+            self.logger.info("Starting proxy file transfer to %s", self.proxy_agent_ip)
             
             # Define progress callback for logging
             def progress_callback(bytes_sent: int, total_bytes: int) -> None:
                 if total_bytes > 0:
                     progress = (bytes_sent / total_bytes) * 100
-                    self.logger.debug(f"Proxy transfer progress: {bytes_sent}/{total_bytes} bytes ({progress:.1f}%)")
+                    self.logger.debug("Proxy transfer progress: %d/%d bytes (%.1f%%)", bytes_sent, total_bytes, progress)
             
             # Send file transfer request to the proxy agent
             success, response = self._file_transfer_service.send_file_transfer_request(
@@ -480,9 +1046,10 @@ class AgentDiscoveryResponseService:
             )
             
             if success and response:
-                self.logger.info(f"Proxy file transfer completed successfully to {self.proxy_agent_ip}")
-                response_src = response.src_name.decode('ascii', errors='ignore')
-                self.logger.debug(f"Received response from proxy agent: {response_src}")
+                self.logger.info("Proxy file transfer completed successfully to %s", self.proxy_agent_ip)
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Received response from proxy agent: %s",
+                                      response.src_name.decode('ascii', errors='ignore'))
             elif success and not response:
                 self.logger.warning(f"Proxy file transfer sent but no response received from {self.proxy_agent_ip}")
             else:
@@ -491,36 +1058,44 @@ class AgentDiscoveryResponseService:
         except Exception as e:
             self.logger.error(f"Error during proxy file transfer to {self.proxy_agent_ip}: {e}")
     
-    def _cleanup_old_files(self) -> None:
+    def _cleanup_old_files(self, new_file: Optional[Path] = None) -> None:
         """
         Clean up old received files, keeping only the most recent max_files_retention files.
-        Files are sorted by modification time (newest first).
+        
+        The directory is scanned (and sorted by modification time) only once; after that
+        received files are tracked oldest-first in a deque, so each call is O(1).
+        
+        Args:
+            new_file: File just received, to be tracked for retention
         """
         try:
-            files_dir = Path(self.files_directory)
-            if not files_dir.exists():
-                return
-            
-            # Get all .raw files in the directory
-            raw_files = list(files_dir.glob("*.raw"))
-            
-            if len(raw_files) <= self.max_files_retention:
-                return  # No cleanup needed
-            
-            # Sort files by modification time (newest first)
-            raw_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-            
-            # Keep only the most recent files
-            files_to_keep = raw_files[:self.max_files_retention]
-            files_to_delete = raw_files[self.max_files_retention:]
+            with self._retention_lock:
+                if self._retained_files is None:
+                    # First call: pick up files left by previous runs, oldest first.
+                    # A single scandir pass; DirEntry caches the stat result.
+                    entries = []
+                    if os.path.isdir(self.files_directory):
+                        with os.scandir(self.files_directory) as it:
+                            entries = [e for e in it if e.name.endswith('.raw') and e.is_file()]
+                    entries.sort(key=lambda e: e.stat().st_mtime)
+                    self._retained_files = deque(Path(e.path) for e in entries)
+                elif new_file is not None:
+                    self._retained_files.append(new_file)
+                
+                excess = len(self._retained_files) - self.max_files_retention
+                if excess <= 0:
+                    return  # No cleanup needed
+                
+                files_to_delete = [self._retained_files.popleft() for _ in range(excess)]
             
-            self.logger.info(f"File retention cleanup: keeping {len(files_to_keep)} files, deleting {len(files_to_delete)} old files")
+            self.logger.info("File retention cleanup: keeping %d files, deleting %d old files",
+                             self.max_files_retention, len(files_to_delete))
             
             # Delete old files
             for file_to_delete in files_to_delete:
                 try:
                     file_to_delete.unlink()
-                    self.logger.debug(f"Deleted old file: {file_to_delete.name}")
+                    self.logger.debug("Deleted old file: %s", file_to_delete.name)
                 except Exception as e:
                     self.logger.warning(f"Failed to delete old file {file_to_delete.name}: {e}")
                     
@@ -531,43 +1106,74 @@ class AgentDiscoveryResponseService:
         """
         Convert raw file to standard format and save to files directory.
         
+        The conversion is CPU-bound, so it runs on the conversion process pool when the
+        service is running; the transfer thread returns as soon as it is queued.
+        
         Args:
             raw_filepath: Path to the received raw file
         """
+        # Save to files directory (parent of files/raw)
+        output_directory = str(Path(self.files_directory).parent)  # files/raw -> files
+        
+        if self._convert_pool is not None:
+            try:
+                future = self._convert_pool.submit(_convert_raw_worker, str(raw_filepath), output_directory)
+                future.add_done_callback(lambda f: self._on_conversion_done(raw_filepath, f))
+                return
+            except Exception as e:
+                self.logger.warning(f"Conversion pool unavailable, converting inline: {e}")
+        
+        future = Future()
         try:
-            converter = RawFileConverter()
-            
-            # Analyze the raw file to determine the appropriate format
-            analysis = converter.analyze_raw_file(raw_filepath)
-            self.logger.info(f"Raw file analysis: {analysis}")
-            
-            # Determine output format based on file analysis
-            # Default to JPG for most scans, PDF for specific formats
-            if analysis.get('format_type') == 'pdf':
-                output_format = 'pdf'
-                extension = '.pdf'
-            else:
-                # Use JPG for images (grayscale, color, B&W)
-                output_format = 'jpg'
-                extension = '.jpg'
-            
-            # Generate output filename (remove .raw extension, add new extension)
-            base_name = raw_filepath.stem  # filename without extension
-            output_filename = f"{base_name}{extension}"
-            
-            # Save to files directory (parent of files/raw)
-            files_dir = Path(self.files_directory).parent  # files/raw -> files
-            output_filepath = files_dir / output_filename
-            
-            # Convert the file
-            if output_format == 'pdf':
-                result_path = converter.convert_to_pdf(raw_filepath, output_filepath)
-            else:
-                result_path = converter.convert_to_jpg(raw_filepath, output_filepath, quality=95)
-            
-            self.logger.info(f"Successfully converted {raw_filepath.name} to {result_path}")
+            future.set_result(_convert_raw_worker(str(raw_filepath), output_directory))
+        except Exception as e:
+            future.set_exception(e)
+        self._on_conversion_done(raw_filepath, future)
+
+    def _on_conversion_done(self, raw_filepath: Path, future: Future) -> None:
+        """
+        Log the outcome of a raw file conversion and apply file retention.
+        
+        Args:
+            raw_filepath: Path to the received raw file
+            future: Completed conversion returning (analysis, converted file path)
+        """
+        try:
+            analysis, result_path = future.result()
+            self.logger.info("Raw file analysis: %s", analysis)
+            self.logger.info("Successfully converted %s to %s", raw_filepath.name, result_path)
             
         except Exception as e:
             self.logger.error(f"Failed to convert raw file {raw_filepath}: {e}")
             # Keep the raw file in case conversion failed
-            self.logger.info(f"Raw file preserved at: {raw_filepath}")
+            self.logger.info("Raw file preserved at: %s", raw_filepath)
+        
+        self._drop_from_page_cache(raw_filepath)
+        
+        # Only converted files enter retention, so queued uploads are never deleted
+        self._cleanup_old_files(raw_filepath)
+
+    def _drop_from_page_cache(self, filepath: Path) -> None:
+        """
+        Tell the kernel a consumed raw file's pages will not be read again.
+        
+        Raw scans are written once and read once (by conversion or forwarding), so
+        keeping them cached only evicts more useful pages. POSIX_FADV_DONTNEED starts
+        writeback of dirty pages and drops the clean ones.
+        
+        Args:
+            filepath: Raw file that has been converted or forwarded
+        """
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        
+        try:
+            fd = os.open(filepath, os.O_RDONLY)
+        except OSError:
+            return  # Already removed by retention cleanup
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError as e:
+            self.logger.debug("posix_fadvise failed for %s: %s", filepath, e)
+        finally:
+            os.close(fd)
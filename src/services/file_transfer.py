@@ -3,18 +3,27 @@ File transfer service implementation.
 Follows SRP - Single responsibility for file transfer operations.
 Uses the same pattern as AgentDiscoveryService for consistency.
 """
+import errno
+import os
+import select
+import selectors
 import socket
 import logging
+import threading
 import time
-from typing import Tuple, Optional, List
+from typing import Dict, Tuple, Optional, List, Set
 from ipaddress import IPv4Address
 from pathlib import Path
 import humanize
 
 from ..dto.network_models import ScannerProtocolMessage, ProtocolConstants
 from ..network.protocols.message_builder import ScannerProtocolMessageBuilder
+from ..network import mmsg
 from ..utils.config import config
 
+# Progress is reported about once per this many bytes sent
+_PROGRESS_STEP = 1 << 20
+
 
 class FileTransferService:
     """
@@ -35,6 +44,24 @@ class FileTransferService:
         self.port = port
         self.tcp_port = tcp_port
         self.logger = logging.getLogger(__name__)
+        self._addr_cache: Dict[Tuple[str, int, int], Tuple[str, int]] = {}
+        self._request_cache: Dict[Tuple[str, str], bytes] = {}  # (src_name, dst_name) -> wire bytes
+        
+        # Request sockets are bound once per calling thread and reused across requests
+        self._udp_local = threading.local()
+        self._udp_sockets: List[socket.socket] = []
+        self._udp_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """Close the UDP sockets held for file transfer requests"""
+        with self._udp_lock:
+            sockets, self._udp_sockets = self._udp_sockets, []
+        for sock in sockets:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._udp_local = threading.local()
     
     def send_file_transfer_request(self, target_ip: str, src_name: str = None, dst_name: str = "", timeout: float = None, file_path: str = None, progress_callback=None) -> Tuple[bool, Optional[ScannerProtocolMessage]]:
         """
@@ -59,34 +86,34 @@ class FileTransferService:
         if file_path is None:
             file_path = config.get('scanner.default_file_path', 'scan.raw')
             
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(config.get('network.socket_timeout', 1.0))
-        
+        sock = None
         try:
-            # Bind to local IP with random port (port 0 = let OS choose)
-            sock.bind((self.local_ip, 0))
-            actual_port = sock.getsockname()[1]  # Get the actual port assigned by OS
+            sock, actual_port = self._request_socket()
             
-            # Build and send file transfer request
-            request_message = self._build_file_transfer_message(src_name, dst_name)
-            request_bytes = request_message.to_bytes()
+            # Build (once per name pair) and send file transfer request
+            request_bytes = self._request_bytes(src_name, dst_name)
             
-            self.logger.info(f"Sending file transfer request ({len(request_bytes)} bytes) from {self.local_ip}:{actual_port} to {target_ip}:{self.port}")
-            self.logger.debug(f"Message type: {request_message.type_of_request.hex()} (should be 5a5400)")
+            self.logger.info("Sending file transfer request (%d bytes) from %s:%d to %s:%d",
+                             len(request_bytes), self.local_ip, actual_port, target_ip, self.port)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                type_end = ProtocolConstants.TYPE_OFFSET + ProtocolConstants.TYPE_SIZE
+                self.logger.debug("Message type: %s (should be 5a5400)",
+                                  request_bytes[ProtocolConstants.TYPE_OFFSET:type_end].hex())
             
-            sock.sendto(request_bytes, (target_ip, self.port))
+            target_addr = self._resolve(target_ip, self.port, socket.SOCK_DGRAM)
+            sock.sendto(request_bytes, target_addr)
             
-            # Listen for response
-            response = self._listen_for_response(sock, target_ip, timeout)
+            # Listen for response (matched against the resolved address)
+            response = self._listen_for_response(sock, target_addr[0], timeout)
             
             if response:
-                self.logger.info(f"Received UDP response from {target_ip}, initiating TCP connection on port {self.tcp_port}")
+                self.logger.info("Received UDP response from %s, initiating TCP connection on port %d", target_ip, self.tcp_port)
                 
                 # Initiate TCP connection for actual file transfer
                 tcp_success = self._initiate_tcp_connection(target_ip, file_path=file_path, progress_callback=progress_callback)
                 
                 if tcp_success:
-                    self.logger.info(f"TCP connection and file transfer completed successfully with {target_ip}:{self.tcp_port}")
+                    self.logger.info("TCP connection and file transfer completed successfully with %s:%d", target_ip, self.tcp_port)
                 else:
                     self.logger.warning(f"TCP connection or file transfer failed with {target_ip}:{self.tcp_port}")
                 
@@ -97,43 +124,223 @@ class FileTransferService:
                 
         except Exception as e:
             self.logger.error(f"Failed to send file transfer request to {target_ip}: {e}")
+            if sock is not None:
+                self._discard_request_socket(sock)
             return False, None
-        finally:
+    
+    def send_file_transfer_requests(self, target_ips: List[str], src_name: str = None, dst_name: str = "", timeout: float = None, file_path: str = None, progress_callback=None) -> Dict[str, Optional[ScannerProtocolMessage]]:
+        """
+        Send file transfer requests to several agents at once, then send the file to each agent that responds
+        
+        All requests go out before any response is awaited, so agents that never
+        answer share a single timeout instead of costing one each.
+        
+        Args:
+            target_ips: IP addresses of the target agents
+            src_name: Source name for the message (uses config default if None)
+            dst_name: Destination name for the message
+            timeout: How long to wait for responses (uses config default if None)
+            file_path: Path to the file to send (uses config default if None)
+            progress_callback: Optional callback function for progress updates
+            
+        Returns:
+            Dict mapping each target IP to its response message, or None if it did not respond
+        """
+        # Use config defaults if not provided
+        if src_name is None:
+            src_name = config.get('scanner.default_src_name', 'Scanner')
+        if timeout is None:
+            timeout = config.get('network.discovery_timeout', 5.0)
+        if file_path is None:
+            file_path = config.get('scanner.default_file_path', 'scan.raw')
+        
+        responses: Dict[str, Optional[ScannerProtocolMessage]] = dict.fromkeys(target_ips)
+        if not target_ips:
+            return responses
+        
+        sock = None
+        try:
+            sock, actual_port = self._request_socket()
+            request_bytes = self._request_bytes(src_name, dst_name)
+            
+            # Responses are attributed to targets by resolved address; targets that
+            # resolve to the same agent share one request and its response
+            datagrams = []
+            targets_by_ip: Dict[str, List[str]] = {}
+            for target_ip in responses:
+                target_addr = self._resolve(target_ip, self.port, socket.SOCK_DGRAM)
+                if target_addr[0] not in targets_by_ip:
+                    targets_by_ip[target_addr[0]] = []
+                    datagrams.append((request_bytes, target_addr))
+                targets_by_ip[target_addr[0]].append(target_ip)
+            
+            self.logger.info("Sending file transfer requests (%d bytes) from %s:%d to %d agents",
+                             len(request_bytes), self.local_ip, actual_port, len(datagrams))
+            
+            if mmsg.is_supported():
+                batch_size = min(len(datagrams), config.get('network.udp_batch_size', 32))
+                mmsg.DatagramBatch(sock, batch_size=batch_size, buffer_size=0).send(datagrams)
+            else:
+                for datagram in datagrams:
+                    sock.sendto(*datagram)
+            
+            received = self._listen_for_responses(sock, set(targets_by_ip), timeout)
+            for ip, response in received.items():
+                for target_ip in targets_by_ip[ip]:
+                    responses[target_ip] = response
+                
+        except Exception as e:
+            self.logger.error(f"Failed to send file transfer requests: {e}")
+            if sock is not None:
+                self._discard_request_socket(sock)
+            return responses
+        
+        for targets in targets_by_ip.values():
+            target_ip = targets[0]
+            response = responses[target_ip]
+            if response is None:
+                self.logger.warning(f"No response received from {', '.join(targets)} within {timeout} seconds")
+                continue
+            
+            self.logger.info("Received UDP response from %s, initiating TCP connection on port %d", target_ip, self.tcp_port)
+            if not self._initiate_tcp_connection(target_ip, file_path=file_path, progress_callback=progress_callback):
+                self.logger.warning(f"TCP connection or file transfer failed with {target_ip}:{self.tcp_port}")
+        
+        return responses
+    
+    def _request_socket(self) -> Tuple[socket.socket, int]:
+        """
+        Get the calling thread's UDP request socket, binding it on first use
+        
+        Replies that arrived after an earlier request gave up waiting are
+        discarded so they cannot be taken for the answer to the next one.
+        
+        Returns:
+            Tuple of (socket, local_port)
+        """
+        local = self._udp_local
+        sock = getattr(local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.settimeout(config.get('network.socket_timeout', 1.0))
+            try:
+                # Bind to local IP with random port (port 0 = let OS choose)
+                sock.bind((self.local_ip, 0))
+            except OSError:
+                sock.close()
+                raise
+            local.sock = sock
+            local.port = sock.getsockname()[1]  # Get the actual port assigned by OS
+            with self._udp_lock:
+                self._udp_sockets.append(sock)
+        else:
+            while select.select([sock], [], [], 0)[0]:
+                sock.recv(1)
+        return sock, local.port
+    
+    def _discard_request_socket(self, sock: socket.socket) -> None:
+        """Close a request socket after an error so the next request binds a fresh one"""
+        self._udp_local.sock = None
+        with self._udp_lock:
+            if sock in self._udp_sockets:
+                self._udp_sockets.remove(sock)
+        try:
             sock.close()
+        except OSError:
+            pass
+    
+    def _resolve(self, target: str, port: int, sock_type: int) -> Tuple[str, int]:
+        """
+        Resolve a target to an IPv4 socket address, once per service instance
+        
+        Args:
+            target: IP address or host name of the target agent
+            port: Destination port
+            sock_type: socket.SOCK_DGRAM or socket.SOCK_STREAM
+            
+        Returns:
+            Socket address tuple (ip, port) usable with sendto/connect
+        """
+        key = (target, port, sock_type)
+        addr = self._addr_cache.get(key)
+        if addr is None:
+            addr = self._addr_cache[key] = socket.getaddrinfo(target, port, socket.AF_INET, sock_type)[0][4]
+        return addr
     
     def _build_file_transfer_message(self, src_name: str, dst_name: str) -> ScannerProtocolMessage:
         """Build a file transfer message using the builder pattern."""
         builder = ScannerProtocolMessageBuilder()
         return builder.build_file_transfer_message(self.local_ip, src_name, dst_name)
     
+    def _request_bytes(self, src_name: str, dst_name: str) -> bytes:
+        """Serialized file transfer request, built on first use for each (src_name, dst_name)"""
+        key = (src_name, dst_name)
+        request_bytes = self._request_cache.get(key)
+        if request_bytes is None:
+            request_bytes = self._request_cache[key] = self._build_file_transfer_message(src_name, dst_name).to_bytes()
+        return request_bytes
+    
     def _listen_for_response(self, sock: socket.socket, target_ip: str, timeout: float) -> Optional[ScannerProtocolMessage]:
         """Listen for file transfer response from the target agent."""
-        start_time = time.time()
+        self.logger.info("Listening for response from %s for %s seconds...", target_ip, timeout)
+        return self._listen_for_responses(sock, {target_ip}, timeout).get(target_ip)
+
+    def _listen_for_responses(self, sock: socket.socket, target_ips: Set[str], timeout: float) -> Dict[str, ScannerProtocolMessage]:
+        """
+        Collect file transfer responses until every target has answered or the timeout expires
         
-        self.logger.info(f"Listening for response from {target_ip} for {timeout} seconds...")
+        Args:
+            sock: UDP socket the requests were sent from
+            target_ips: Resolved IP addresses of the agents being waited for
+            timeout: How long to wait in total
+            
+        Returns:
+            Dict mapping each responding IP address to its parsed response
+        """
+        deadline = time.monotonic() + timeout
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        pending = set(target_ips)
+        responses: Dict[str, ScannerProtocolMessage] = {}
         
-        while time.time() - start_time < timeout:
-            try:
-                resp, addr = sock.recvfrom(config.get('network.buffer_size', 1024))
+        # Datagrams are received into one buffer; stray ones are dropped without being copied
+        buffer = bytearray(config.get('network.buffer_size', 1024))
+        view = memoryview(buffer)
+        
+        # Sleep in the kernel until a datagram arrives or the deadline passes,
+        # instead of waking on every socket timeout to re-check the clock
+        with selectors.DefaultSelector() as selector:
+            selector.register(sock, selectors.EVENT_READ)
+            
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    break
                 
-                # Only accept responses from the target IP
-                if addr[0] == target_ip:
-                    self.logger.info(f"=== RESPONSE FROM {addr[0]}:{addr[1]} ===")
-                    try:
-                        response_message = ScannerProtocolMessage.from_bytes(resp)
-                        self.logger.info(f"Successfully parsed response from {addr}")
-                        self.logger.debug(f"Response type: {response_message.type_of_request.hex()}")
-                        return response_message
-                    except Exception as e:
-                        self.logger.error(f"Failed to parse response from {addr}: {e}")
-                        self.logger.debug(f"Raw response: {resp.hex()}")
-                else:
-                    self.logger.debug(f"Ignoring response from unexpected IP {addr[0]} (expecting {target_ip})")
+                try:
+                    received, addr = sock.recvfrom_into(buffer)
+                except (BlockingIOError, socket.timeout):
+                    continue
                 
-            except socket.timeout:
-                continue
+                # Only accept responses from target IPs still being waited for
+                if addr[0] not in pending:
+                    if debug_enabled:
+                        self.logger.debug("Ignoring response from unexpected IP %s", addr[0])
+                    continue
                 
-        return None
+                self.logger.info("=== RESPONSE FROM %s:%d ===", addr[0], addr[1])
+                try:
+                    response_message = ScannerProtocolMessage.from_bytes(view[:received])
+                    self.logger.info("Successfully parsed response from %s", addr)
+                    if debug_enabled:
+                        self.logger.debug("Response type: %s", response_message.type_of_request.hex())
+                    responses[addr[0]] = response_message
+                    pending.discard(addr[0])
+                except Exception as e:
+                    self.logger.error(f"Failed to parse response from {addr}: {e}")
+                    if debug_enabled:
+                        self.logger.debug("Raw response: %s", view[:received].hex())
+        
+        return responses
 
     def _initiate_tcp_connection(self, target_ip: str, connection_timeout: float = None, file_path: str = None, progress_callback=None) -> bool:
         """
@@ -154,22 +361,20 @@ class FileTransferService:
         if file_path is None:
             file_path = config.get('scanner.default_file_path', 'scan.raw')
             
-        tcp_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        tcp_sock.settimeout(connection_timeout)
-        
+        tcp_sock = None
         try:
-            self.logger.info(f"Attempting TCP connection to {target_ip}:{self.tcp_port}")
+            self.logger.info("Attempting TCP connection to %s:%d", target_ip, self.tcp_port)
             
             # Connect to the agent's TCP port
-            tcp_sock.connect((target_ip, self.tcp_port))
+            tcp_sock = self._connect_tcp(target_ip, connection_timeout)
             
-            self.logger.info(f"TCP connection established with {target_ip}:{self.tcp_port}")
+            self.logger.info("TCP connection established with %s:%d", target_ip, self.tcp_port)
             
             # Send the file immediately after connection is established
             file_sent = self._send_file_over_tcp(tcp_sock, file_path, progress_callback)
             
             if file_sent:
-                self.logger.info(f"File {file_path} sent successfully to {target_ip}")
+                self.logger.info("File %s sent successfully to %s", file_path, target_ip)
                 return True
             else:
                 self.logger.error(f"Failed to send file {file_path} to {target_ip}")
@@ -185,8 +390,60 @@ class FileTransferService:
             self.logger.error(f"TCP connection error to {target_ip}:{self.tcp_port}: {e}")
             return False
         finally:
-            tcp_sock.close()
-            self.logger.info(f"TCP connection closed with {target_ip}:{self.tcp_port}")
+            if tcp_sock is not None:
+                tcp_sock.close()
+                self.logger.info("TCP connection closed with %s:%d", target_ip, self.tcp_port)
+
+    def _connect_tcp(self, target_ip: str, connection_timeout: float) -> socket.socket:
+        """
+        Connect to the agent's TCP port, retrying with growing per-attempt timeouts
+        
+        A lost SYN then costs a short attempt rather than the whole connection timeout.
+        
+        Args:
+            target_ip: IP address of the target agent
+            connection_timeout: Total time allowed for connecting and for each blocking send
+            
+        Returns:
+            Connected TCP socket
+            
+        Raises:
+            socket.timeout: If no attempt succeeded within connection_timeout
+        """
+        addr = self._resolve(target_ip, self.tcp_port, socket.SOCK_STREAM)
+        deadline = time.monotonic() + connection_timeout
+        attempt_timeout = config.get('network.tcp_connect_timeout_initial', 1.5)
+        sndbuf = config.get('network.so_sndbuf', 12582912)
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout("timed out")
+            attempt_timeout = min(attempt_timeout, remaining)
+            
+            tcp_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                # Size the send buffer before connect() so the window scale is negotiated for it;
+                # Nagle is off since TCP_CORK already coalesces the file body
+                tcp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf)
+                tcp_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                if hasattr(socket, 'TCP_USER_TIMEOUT'):
+                    # Fail a stalled transfer once data goes unacknowledged this long
+                    tcp_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, int(connection_timeout * 1000))
+                
+                tcp_sock.bind((self.local_ip, 0))
+                tcp_sock.settimeout(attempt_timeout)
+                tcp_sock.connect(addr)
+                tcp_sock.settimeout(connection_timeout)
+                return tcp_sock
+            except socket.timeout:
+                tcp_sock.close()
+                self.logger.debug("TCP connect attempt to %s:%d timed out after %.1fs, retrying",
+                                  target_ip, self.tcp_port, attempt_timeout)
+                attempt_timeout *= 2
+            except BaseException:
+                tcp_sock.close()
+                raise
 
     def _send_file_over_tcp(self, tcp_sock: socket.socket, file_path: str, progress_callback=None) -> bool:
         """
@@ -201,44 +458,136 @@ class FileTransferService:
             True if file sent successfully, False otherwise
         """
         try:
-            # Check if file exists using pathlib
-            file_path_obj = Path(file_path)
-            if not file_path_obj.exists():
+            # Open first and size the open descriptor: one path lookup, and the size
+            # always describes the file actually being sent
+            try:
+                file = Path(file_path).open('rb')
+            except FileNotFoundError:
                 self.logger.error(f"File {file_path} does not exist")
                 return False
             
-            file_size = file_path_obj.stat().st_size
-            self.logger.info(f"Preparing to send file {file_path} ({humanize.naturalsize(file_size)})")
-            
-            # Send file contents directly in chunks without protocol messages
-            chunk_size = config.get('network.tcp_chunk_size', 8192)
-            bytes_sent = 0
-            
-            with file_path_obj.open('rb') as file:
-                while True:
-                    chunk = file.read(chunk_size)
-                    if not chunk:
-                        break
-                    
-                    tcp_sock.sendall(chunk)
-                    bytes_sent += len(chunk)
-                    
-                    # Call progress callback if provided
-                    if progress_callback:
-                        progress_callback(bytes_sent, file_size)
-                    
-                    # Log progress periodically (less frequent now since we have visual progress)
-                    if bytes_sent % (chunk_size * 50) == 0:  # Log every ~400KB instead of every 80KB
-                        progress = (bytes_sent / file_size) * 100
-                        self.logger.debug(f"File transfer progress: {bytes_sent}/{file_size} bytes ({progress:.1f}%)")
+            with file:
+                file_size = os.fstat(file.fileno()).st_size
+                self.logger.info("Preparing to send file %s (%s)", file_path, humanize.naturalsize(file_size))
+                
+                # Cork so the kernel only emits full-MSS segments; uncorking flushes the tail
+                self._set_cork(tcp_sock, True)
+                try:
+                    bytes_sent = None
+                    if hasattr(os, 'sendfile'):
+                        bytes_sent = self._sendfile(tcp_sock, file, file_size, progress_callback)
+                    if bytes_sent is None:
+                        bytes_sent = self._send_chunks(tcp_sock, file, file_size, progress_callback)
+                finally:
+                    self._set_cork(tcp_sock, False)
             
             # Final progress update
             if progress_callback:
                 progress_callback(file_size, file_size)
                 
-            self.logger.info(f"File transfer completed successfully: {bytes_sent} bytes sent")
+            self.logger.info("File transfer completed successfully: %d bytes sent", bytes_sent)
             return True
                 
         except Exception as e:
             self.logger.error(f"Error sending file over TCP: {e}")
             return False
+
+    def _sendfile(self, tcp_sock: socket.socket, file, file_size: int, progress_callback=None) -> Optional[int]:
+        """
+        Send an open file with os.sendfile, letting the kernel copy straight from the page cache
+        
+        Args:
+            tcp_sock: Established TCP socket
+            file: File object opened for binary reading
+            file_size: Number of bytes to send
+            progress_callback: Optional callback function for progress updates (bytes_sent, total_bytes)
+            
+        Returns:
+            Number of bytes sent, or None if sendfile is not supported for this file
+        """
+        sock_fd = tcp_sock.fileno()
+        file_fd = file.fileno()
+        timeout = tcp_sock.gettimeout()
+        bytes_sent = 0
+        
+        # Report progress about once per MiB; the caller sends the final update
+        next_report_at = _PROGRESS_STEP
+        
+        while bytes_sent < file_size:
+            try:
+                sent = os.sendfile(sock_fd, file_fd, bytes_sent, file_size - bytes_sent)
+            except BlockingIOError:
+                # A socket with a timeout is non-blocking underneath: wait for send buffer space
+                _, writable, _ = select.select([], [tcp_sock], [], timeout)
+                if not writable:
+                    raise socket.timeout("timed out waiting to send file data")
+                continue
+            except OSError as e:
+                # Not a regular file, or a filesystem without sendfile support
+                if bytes_sent == 0 and e.errno in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                    self.logger.debug("sendfile unavailable (%s), falling back to chunked send", e)
+                    return None
+                raise
+            
+            if not sent:
+                break  # File shrank while sending
+            bytes_sent += sent
+            
+            if bytes_sent >= next_report_at:
+                next_report_at = bytes_sent + _PROGRESS_STEP
+                if progress_callback:
+                    progress_callback(bytes_sent, file_size)
+                self.logger.debug("File transfer progress: %d/%d bytes (%.1f%%)",
+                                  bytes_sent, file_size, (bytes_sent / file_size) * 100)
+        
+        return bytes_sent
+
+    def _send_chunks(self, tcp_sock: socket.socket, file, file_size: int, progress_callback=None) -> int:
+        """
+        Send an open file with read/sendall, for platforms without os.sendfile
+        
+        Args:
+            tcp_sock: Established TCP socket
+            file: File object opened for binary reading
+            file_size: Number of bytes to send
+            progress_callback: Optional callback function for progress updates (bytes_sent, total_bytes)
+            
+        Returns:
+            Number of bytes sent
+        """
+        # Send file contents directly in chunks without protocol messages;
+        # a chunk larger than the send buffer would only be split by sendall()
+        chunk_size = min(config.get('network.tcp_chunk_size', 1048576),
+                         tcp_sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF))
+        bytes_sent = 0
+        
+        # One reusable buffer instead of a new bytes object per chunk
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        
+        # Report progress about once per MiB; the caller sends the final update
+        report_step = max(chunk_size, _PROGRESS_STEP)
+        next_report_at = report_step
+        
+        while True:
+            count = file.readinto(buffer)
+            if not count:
+                break
+            
+            tcp_sock.sendall(view[:count])
+            bytes_sent += count
+            
+            if bytes_sent >= next_report_at:
+                next_report_at += report_step
+                if progress_callback:
+                    progress_callback(bytes_sent, file_size)
+                self.logger.debug("File transfer progress: %d/%d bytes (%.1f%%)",
+                                  bytes_sent, file_size, (bytes_sent / file_size) * 100)
+        
+        return bytes_sent
+
+    @staticmethod
+    def _set_cork(tcp_sock: socket.socket, enabled: bool) -> None:
+        """Toggle TCP_CORK where the platform supports it"""
+        if hasattr(socket, 'TCP_CORK'):
+            tcp_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1 if enabled else 0)
@@ -6,12 +6,21 @@ The raw format uses a custom header structure and includes end-of-line markers.
 """
 
 import logging
+import mmap
+import os
 import struct
 from pathlib import Path
 from typing import Optional, Tuple, Dict, Any
 from PIL import Image
 import numpy as np
 
+# 16-byte header: scan type, quality, 2 format bytes, 8 skipped bytes, width (LE), 2 pad bytes
+_HEADER = struct.Struct('<4B8xH2x')
+_U16 = struct.Struct('<H')
+
+# Black & white scans: pixels above this level become white
+_BW_THRESHOLD = 128
+
 
 class RawFileConverter:
     """
@@ -58,32 +67,59 @@ class RawFileConverter:
             (0x50, 0x44): 'pdf',  # ASCII 'PD' (alternative PDF marker)
             (0x50, 0x46): 'pdf'   # ASCII 'PF' (alternative PDF marker)
         }
+        
+        # Last analysis as ((path, mtime_ns, size), metadata); lets a conversion
+        # that follows analyze_raw_file() on the same file skip the header parse
+        self._last_analysis: Optional[Tuple[Tuple[str, int, int], Dict[str, Any]]] = None
     
-    def analyze_raw_file(self, file_path: Path) -> Dict[str, Any]:
+    def _open_mmap(self, file_path: Path) -> mmap.mmap:
         """
-        Analyze a raw file and extract metadata from its header.
+        Map a raw file read-only so analysis and extraction share one set of pages.
         
         Args:
             file_path: Path to the raw file
             
         Returns:
-            Dictionary containing file metadata
+            Read-only memory map of the whole file (the caller closes it)
         """
         if not file_path.exists():
             raise FileNotFoundError(f"Raw file not found: {file_path}")
             
         with open(file_path, 'rb') as f:
-            header = f.read(16)
+            file_size = os.fstat(f.fileno()).st_size
+            if file_size < 16:
+                raise ValueError(f"Invalid raw file: header too short ({file_size} bytes)")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            # Rows are read front to back; let the kernel read ahead aggressively
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return mm
+    
+    def analyze_raw_file(self, file_path: Path, mm: Optional[mmap.mmap] = None) -> Dict[str, Any]:
+        """
+        Analyze a raw file and extract metadata from its header.
+        
+        Args:
+            file_path: Path to the raw file
+            mm: Memory map of the file from _open_mmap (mapped here if None)
+            
+        Returns:
+            Dictionary containing file metadata
+        """
+        try:
+            stat = os.stat(file_path)
+            cache_key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            cache_key = None
+        if cache_key is not None and self._last_analysis is not None and self._last_analysis[0] == cache_key:
+            return dict(self._last_analysis[1])
             
-        if len(header) < 16:
-            raise ValueError(f"Invalid raw file: header too short ({len(header)} bytes)")
+        if mm is None:
+            with self._open_mmap(file_path) as mm:
+                return self.analyze_raw_file(file_path, mm)
             
-        # Parse header
-        scan_type_byte = header[0]
-        quality_byte = header[1]
-        format_byte1 = header[2]
-        format_byte2 = header[3]
-        header_width = struct.unpack('<H', header[12:14])[0]  # This might be row data width, not pixel width
+        # Parse header; header_width might be row data width, not pixel width
+        scan_type_byte, quality_byte, format_byte1, format_byte2, header_width = _HEADER.unpack_from(mm, 0)
         
         # Interpret header values
         scan_type = self.scan_type_map.get(scan_type_byte, f'unknown_0x{scan_type_byte:02X}')
@@ -111,7 +147,7 @@ class RawFileConverter:
             row_data_width = header_width
             
         # Analyze file structure to find height
-        file_size = file_path.stat().st_size
+        file_size = len(mm)
         header_size = 16  # Fixed header size
             
         # Calculate expected row structure
@@ -131,36 +167,44 @@ class RawFileConverter:
             pixel_data_per_row = 0
             
         # Verify our calculation by checking actual EOL markers at expected positions
-        eol_marker = struct.pack('<H', header_width)  # Use header_width for EOL marker
+        eol_marker = _U16.pack(header_width)  # Use header_width for EOL marker
         verified_height = 0
         
         if height > 0:
-            with open(file_path, 'rb') as f:
-                f.seek(header_size)  # Skip header
-                
-                for row in range(min(height, 10)):  # Check first 10 rows for verification
-                    # Skip to expected EOL position
-                    f.seek(header_size + row * row_size + pixel_data_per_row)
-                    
-                    # Read potential EOL marker
-                    potential_eol = f.read(2)
-                    if potential_eol == eol_marker:
-                        verified_height += 1
-                    else:
-                        # If EOL doesn't match, our calculation might be wrong
-                        self.logger.warning(f"EOL verification failed at row {row}: expected {eol_marker.hex()}, got {potential_eol.hex()}")
-                        break
+            for row in range(min(height, 10)):  # Check first 10 rows for verification
+                # Read potential EOL marker at the expected position
+                eol_position = header_size + row * row_size + pixel_data_per_row
+                potential_eol = mm[eol_position:eol_position + 2]
+                if potential_eol == eol_marker:
+                    verified_height += 1
+                else:
+                    # If EOL doesn't match, our calculation might be wrong
+                    self.logger.warning(f"EOL verification failed at row {row}: expected {eol_marker.hex()}, got {potential_eol.hex()}")
+                    break
                         
-            # If verification failed for early rows, fall back to counting all EOL markers
+            # If verification failed for early rows, locate the row size from the first EOL
+            # marker, and only if that fails too fall back to counting all EOL markers
             if verified_height < min(height, 10) and verified_height < 5:
-                self.logger.warning("Row structure verification failed, falling back to EOL marker counting")
-                with open(file_path, 'rb') as f:
-                    data = f.read()
-                height = data.count(eol_marker)
-                if height > 0:
-                    data_size = file_size - header_size
-                    row_size = data_size // height
+                located_row_size = self._locate_row_size(mm, header_size, eol_marker, expected_pixel_data_per_row)
+                if located_row_size:
+                    self.logger.info("Row size %d located from the first EOL marker", located_row_size)
+                    row_size = located_row_size
                     pixel_data_per_row = row_size - 4
+                    height = data_size // row_size
+                else:
+                    self.logger.warning("Row structure verification failed, falling back to EOL marker counting")
+                    # Count non-overlapping matches at any byte offset of the row data, like
+                    # bytes.count (rows may be odd-sized, so markers are not always 16-bit
+                    # aligned); the header's own width field is excluded
+                    height = 0
+                    position = mm.find(eol_marker, header_size)
+                    while position >= 0:
+                        height += 1
+                        position = mm.find(eol_marker, position + len(eol_marker))
+                    if height > 0:
+                        data_size = file_size - header_size
+                        row_size = data_size // height
+                        pixel_data_per_row = row_size - 4
             
         metadata = {
             'scan_type': scan_type,
@@ -179,85 +223,155 @@ class RawFileConverter:
         }
         
         self.logger.info(f"Raw file analysis: {metadata}")
+        if cache_key is not None:
+            self._last_analysis = (cache_key, dict(metadata))
         return metadata
     
-    def extract_image_data(self, file_path: Path) -> Tuple[np.ndarray, Dict[str, Any]]:
+    def _locate_row_size(self, mm: mmap.mmap, header_size: int, eol_marker: bytes,
+                         min_pixel_data: int) -> int:
+        """
+        Find the row size from the first EOL marker, checking it against the next rows.
+        
+        Only the first row and the marker positions of up to 9 further rows are
+        read, so a layout with unexpected padding does not need a full-file scan.
+        
+        Args:
+            mm: Memory map of the raw file
+            header_size: Size of the file header in bytes
+            eol_marker: Packed EOL marker
+            min_pixel_data: Smallest possible amount of pixel data per row
+            
+        Returns:
+            Row size in bytes, or 0 if no consistent row size was found
+        """
+        data_size = len(mm) - header_size
+        search_start = header_size + min_pixel_data
+        search_end = header_size + min(data_size, 2 * min_pixel_data + 8)
+        offset = mm.find(eol_marker, search_start, search_end)
+        if offset < 0:
+            return 0
+            
+        row_size = offset - header_size + 4  # +4 for EOL + padding
+        rows = data_size // row_size
+        if rows == 0:
+            return 0
+        for row in range(1, min(rows, 10)):
+            eol_position = offset + row * row_size
+            if mm[eol_position:eol_position + 2] != eol_marker:
+                return 0
+        return row_size
+    
+    def extract_image_data(self, file_path: Path, threshold: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
         """
         Extract image data from raw file.
         
         Args:
             file_path: Path to the raw file
+            threshold: If set, black & white scans are binarized to 0/255 at this
+                       level while being extracted (other scan types are unaffected)
             
         Returns:
             Tuple of (image_array, metadata)
         """
-        metadata = self.analyze_raw_file(file_path)
-        
-        with open(file_path, 'rb') as f:
-            # Skip header
-            f.seek(metadata['header_size'])
-            
-            # Extract image data
-            width = metadata['width']
-            height = metadata['height']
-            row_size = metadata['row_size']
-            pixel_data_per_row = metadata['pixel_data_per_row']
-            scan_type = metadata['scan_type']
+        with self._open_mmap(file_path) as mm:
+            metadata = self.analyze_raw_file(file_path, mm)
+            image_array = self._extract_rows(mm, metadata, threshold)
             
-            image_data = []
-            eol_marker = struct.pack('<H', width)
+        return image_array, metadata
+    
+    def _extract_rows(self, mm: mmap.mmap, metadata: Dict[str, Any], threshold: Optional[int] = None) -> np.ndarray:
+        """
+        Slice the pixel data out of a mapped raw file.
+        
+        Args:
+            mm: Memory map of the raw file
+            metadata: Metadata from analyze_raw_file
+            threshold: Binarization level for black & white scans, or None
             
-            for row in range(height):
-                # Read entire row of data
-                row_data = f.read(row_size)
-                if len(row_data) < row_size:
-                    self.logger.warning(f"Incomplete row {row}: got {len(row_data)} bytes, expected {row_size}")
-                    break
-                    
-                # Extract pixel data from the beginning of the row
-                pixel_data = row_data[:pixel_data_per_row]
-                
-                # Verify EOL marker at the expected position (after pixel data)
-                eol_position = pixel_data_per_row
-                actual_eol = row_data[eol_position:eol_position+2]
-                
-                if actual_eol != eol_marker:
-                    self.logger.warning(f"EOL marker mismatch in row {row}: expected {eol_marker.hex()} at position {eol_position}, got {actual_eol.hex()}")
-                    # Continue processing anyway, but log the issue
+        Returns:
+            Image array that owns its memory, so the map can be closed afterwards
+        """
+        width = metadata['width']
+        height = metadata['height']
+        row_size = metadata['row_size']
+        pixel_data_per_row = metadata['pixel_data_per_row']
+        scan_type = metadata['scan_type']
+        header_size = metadata['header_size']
+        
+        # View all rows in place as a (rows, row_size) byte matrix
+        data_size = min(height * row_size, len(mm) - header_size)
+        complete_rows = data_size // row_size if row_size > 0 else 0
+        if complete_rows < height:
+            self.logger.warning(f"Incomplete row {complete_rows}: got {data_size - complete_rows * row_size} bytes, expected {row_size}")
+        if complete_rows == 0:
+            raise ValueError("No valid image data extracted")
+        
+        # Color rows hold RGB data (3 bytes per pixel); B&W and grayscale 1 byte per pixel
+        rgb = scan_type == 'color' and pixel_data_per_row >= width * 3
+        if not rgb and pixel_data_per_row < width:
+            expected_bytes = width * 3 if scan_type == 'color' else width
+            self.logger.warning(f"Insufficient pixel data in row 0: got {pixel_data_per_row} bytes, expected at least {expected_bytes}")
+            raise ValueError("No valid image data extracted")
+        
+        # Checks are done before the view is created: a view left alive by an
+        # exception would keep the map from closing
+        rows = np.frombuffer(mm, dtype=np.uint8, count=complete_rows * row_size,
+                             offset=header_size).reshape(complete_rows, row_size)
+        
+        # Verify the EOL marker after the pixel data of every row in one comparison
+        eol_marker = metadata['header_width']
+        if row_size >= pixel_data_per_row + 2:
+            eol_values = np.ascontiguousarray(rows[:, pixel_data_per_row:pixel_data_per_row + 2]).view('<u2').ravel()
+            mismatched = np.flatnonzero(eol_values != eol_marker)
+            if mismatched.size:
+                first = mismatched[0]
+                self.logger.warning(f"EOL marker mismatch in {mismatched.size} rows (rows {mismatched[:10].tolist()}): "
+                                    f"expected {eol_marker:04x} at position {pixel_data_per_row}, got {eol_values[first]:04x}")
+                # Continue processing anyway, but log the issue
+        
+        # Copy the pixel columns out of the map based on scan type
+        if rgb:
+            image_array = np.array(rows[:, :width * 3]).reshape(complete_rows, width, 3)
+            self.logger.info(f"Extracted RGB image array shape: {image_array.shape} for {scan_type} image")
+        elif threshold is not None and scan_type == 'black_white':
+            # Threshold straight out of the map: the comparison's bool buffer becomes the 0/255 image
+            image_array = (rows[:, :width] > threshold).view(np.uint8)
+            image_array *= 255
+            self.logger.info(f"Extracted grayscale image array shape: {image_array.shape} for {scan_type} image")
+        else:
+            image_array = np.array(rows[:, :width])
+            self.logger.info(f"Extracted grayscale image array shape: {image_array.shape} for {scan_type} image")
                 
-                # Convert pixel data based on scan type
-                if scan_type == 'color' and len(pixel_data) >= width * 3:
-                    # For color images, we have RGB data (3 bytes per pixel)
-                    # Reshape to (width, 3) for RGB channels
-                    rgb_data = np.frombuffer(pixel_data[:width * 3], dtype=np.uint8)
-                    rgb_row = rgb_data.reshape((width, 3))
-                    image_data.append(rgb_row)
-                elif len(pixel_data) >= width:
-                    # For B&W or grayscale (1 byte per pixel)
-                    row_pixels = list(pixel_data[:width])
-                    image_data.append(row_pixels)
-                else:
-                    expected_bytes = width * 3 if scan_type == 'color' else width
-                    self.logger.warning(f"Insufficient pixel data in row {row}: got {len(pixel_data)} bytes, expected at least {expected_bytes}")
-                    break
+        return image_array
+    
+    @staticmethod
+    def _image_from_array(image_array: np.ndarray, mode: str) -> Image.Image:
+        """
+        Wrap an image array in a PIL image for encoding.
+        
+        Single-channel images share the array's memory instead of being copied;
+        PIL stores RGB as 4 bytes per pixel, so RGB data is always converted.
+        For mode '1' the array is packed to one bit per pixel (nonzero is white).
+        
+        Args:
+            image_array: C-contiguous uint8 array, (height, width) or (height, width, 3)
+            mode: PIL mode, '1', 'L' or 'RGB'
             
-            # Convert to numpy array
-            if image_data:
-                if scan_type == 'color':
-                    # For color images, stack the RGB rows
-                    image_array = np.array(image_data, dtype=np.uint8)
-                    self.logger.info(f"Extracted RGB image array shape: {image_array.shape} for {scan_type} image")
-                else:
-                    # For B&W and grayscale images
-                    image_array = np.array(image_data, dtype=np.uint8)
-                    self.logger.info(f"Extracted grayscale image array shape: {image_array.shape} for {scan_type} image")
-            else:
-                raise ValueError("No valid image data extracted")
-                
-        return image_array, metadata
+        Returns:
+            PIL image backed by (or converted from) image_array
+        """
+        if mode == '1':
+            height, width = image_array.shape
+            bits = np.packbits(image_array, axis=1)
+            return Image.frombuffer('1', (width, height), bits, 'raw', '1', 0, 1)
+        if mode == 'L':
+            image_array = np.ascontiguousarray(image_array)
+            height, width = image_array.shape
+            return Image.frombuffer('L', (width, height), image_array, 'raw', 'L', 0, 1)
+        return Image.fromarray(image_array)
     
     def convert_to_jpg(self, raw_file_path: Path, output_path: Optional[Path] = None, 
-                      quality: int = 95) -> Path:
+                      quality: int = 95, optimize: bool = False) -> Path:
         """
         Convert raw file to JPG format.
         
@@ -265,12 +379,13 @@ class RawFileConverter:
             raw_file_path: Path to the input raw file
             output_path: Path for output JPG file (optional)
             quality: JPG quality (1-100)
+            optimize: Build optimal Huffman tables (an extra encoder pass for a few percent smaller files)
             
         Returns:
             Path to the created JPG file
         """
-        # Extract image data
-        image_array, metadata = self.extract_image_data(raw_file_path)
+        # Extract image data (black & white scans come back thresholded)
+        image_array, metadata = self.extract_image_data(raw_file_path, threshold=_BW_THRESHOLD)
         
         # Determine output path
         if output_path is None:
@@ -278,27 +393,25 @@ class RawFileConverter:
             
         # Create PIL Image
         if metadata['scan_type'] == 'black_white':
-            # For black & white, apply thresholding
-            threshold = 128
-            image_array = np.where(image_array > threshold, 255, 0).astype(np.uint8)
-            pil_image = Image.fromarray(image_array, mode='L')
+            # For black & white, thresholding was applied during extraction
+            pil_image = self._image_from_array(image_array, 'L')
         elif metadata['scan_type'] == 'grayscale':
-            pil_image = Image.fromarray(image_array, mode='L')
+            pil_image = self._image_from_array(image_array, 'L')
         elif metadata['scan_type'] == 'color':
             # For color images, we now have proper RGB data
             if len(image_array.shape) == 3 and image_array.shape[2] == 3:
                 # RGB image (height, width, 3)
-                pil_image = Image.fromarray(image_array, mode='RGB')
+                pil_image = self._image_from_array(image_array, 'RGB')
                 self.logger.info("Color image converted as RGB")
             else:
                 # Fallback to grayscale if color processing failed
                 self.logger.warning("Color image processing failed, converting as grayscale")
-                pil_image = Image.fromarray(image_array, mode='L')
+                pil_image = self._image_from_array(image_array, 'L')
         else:
-            pil_image = Image.fromarray(image_array, mode='L')
+            pil_image = self._image_from_array(image_array, 'L')
             
         # Save as JPG
-        pil_image.save(output_path, 'JPEG', quality=quality, optimize=True)
+        pil_image.save(output_path, 'JPEG', quality=quality, optimize=optimize, progressive=False)
         
         self.logger.info(f"Converted {raw_file_path} to {output_path}")
         return output_path
@@ -314,8 +427,8 @@ class RawFileConverter:
         Returns:
             Path to the created PNG file
         """
-        # Extract image data
-        image_array, metadata = self.extract_image_data(raw_file_path)
+        # Extract image data (black & white scans come back thresholded)
+        image_array, metadata = self.extract_image_data(raw_file_path, threshold=_BW_THRESHOLD)
         
         # Determine output path
         if output_path is None:
@@ -323,23 +436,22 @@ class RawFileConverter:
             
         # Create PIL Image
         if metadata['scan_type'] == 'black_white':
-            threshold = 128
-            image_array = np.where(image_array > threshold, 255, 0).astype(np.uint8)
-            pil_image = Image.fromarray(image_array, mode='L')
+            # PNG stores bilevel images at 1 bit per pixel
+            pil_image = self._image_from_array(image_array, '1')
         elif metadata['scan_type'] == 'grayscale':
-            pil_image = Image.fromarray(image_array, mode='L')
+            pil_image = self._image_from_array(image_array, 'L')
         elif metadata['scan_type'] == 'color':
             # For color images, we now have proper RGB data
             if len(image_array.shape) == 3 and image_array.shape[2] == 3:
                 # RGB image (height, width, 3)
-                pil_image = Image.fromarray(image_array, mode='RGB')
+                pil_image = self._image_from_array(image_array, 'RGB')
                 self.logger.info("Color image converted as RGB")
             else:
                 # Fallback to grayscale if color processing failed
                 self.logger.warning("Color image processing failed, converting as grayscale")
-                pil_image = Image.fromarray(image_array, mode='L')
+                pil_image = self._image_from_array(image_array, 'L')
         else:
-            pil_image = Image.fromarray(image_array, mode='L')
+            pil_image = self._image_from_array(image_array, 'L')
             
         # Save as PNG
         pil_image.save(output_path, 'PNG', optimize=True)
@@ -360,8 +472,8 @@ class RawFileConverter:
         Returns:
             Path to the created PDF file
         """
-        # Extract image data
-        image_array, metadata = self.extract_image_data(raw_file_path)
+        # Extract image data (black & white scans come back thresholded)
+        image_array, metadata = self.extract_image_data(raw_file_path, threshold=_BW_THRESHOLD)
         
         # Determine output path
         if output_path is None:
@@ -369,23 +481,21 @@ class RawFileConverter:
             
         # Create PIL Image
         if metadata['scan_type'] == 'black_white':
-            threshold = 128
-            image_array = np.where(image_array > threshold, 255, 0).astype(np.uint8)
-            pil_image = Image.fromarray(image_array, mode='L')
+            pil_image = self._image_from_array(image_array, 'L')
         elif metadata['scan_type'] == 'grayscale':
-            pil_image = Image.fromarray(image_array, mode='L')
+            pil_image = self._image_from_array(image_array, 'L')
         elif metadata['scan_type'] == 'color':
             # For color images, we now have proper RGB data
             if len(image_array.shape) == 3 and image_array.shape[2] == 3:
                 # RGB image (height, width, 3)
-                pil_image = Image.fromarray(image_array, mode='RGB')
+                pil_image = self._image_from_array(image_array, 'RGB')
                 self.logger.info("Color image converted as RGB")
             else:
                 # Fallback to grayscale if color processing failed
                 self.logger.warning("Color image processing failed, converting as grayscale")
-                pil_image = Image.fromarray(image_array, mode='L')
+                pil_image = self._image_from_array(image_array, 'L')
         else:
-            pil_image = Image.fromarray(image_array, mode='L')
+            pil_image = self._image_from_array(image_array, 'L')
             
         # Save as PDF
         # PIL can save images directly as PDF
@@ -401,7 +511,7 @@ class RawFileConverter:
 
 
 def convert_raw_file(input_path: str, output_path: Optional[str] = None, 
-                    output_format: str = 'jpg', quality: int = 95) -> str:
+                    output_format: str = 'jpg', quality: int = 95, optimize: bool = False) -> str:
     """
     Convenience function to convert a raw file to standard image format.
     
@@ -410,6 +520,7 @@ def convert_raw_file(input_path: str, output_path: Optional[str] = None,
         output_path: Path for output file (optional)
         output_format: Output format ('jpg', 'png', or 'pdf')
         quality: JPG/PDF quality if applicable (1-100)
+        optimize: Optimize JPG Huffman tables (slower encode, slightly smaller file)
         
     Returns:
         Path to the converted file
@@ -423,7 +534,7 @@ def convert_raw_file(input_path: str, output_path: Optional[str] = None,
         out_path = None
         
     if output_format.lower() in ['jpg', 'jpeg']:
-        result_path = converter.convert_to_jpg(raw_path, out_path, quality)
+        result_path = converter.convert_to_jpg(raw_path, out_path, quality, optimize)
     elif output_format.lower() == 'png':
         result_path = converter.convert_to_png(raw_path, out_path)
     elif output_format.lower() == 'pdf':
@@ -64,7 +64,7 @@ class ConfigurationManager:
                 "discovery_timeout": 10.0,
                 "socket_timeout": 1.0,
                 "buffer_size": 1024,
-                "tcp_chunk_size": 8192,
+                "tcp_chunk_size": 1048576,
                 "tcp_connection_timeout": 10.0
             },
             "scanner": {
@@ -73,12 +73,6 @@ class ConfigurationManager:
                 "default_file_path": "files/scan.raw",
                 "files_directory": "files"
             },
-            "file_transfer": {
-                "handshake_message": "FILE_TRANSFER_READY",
-                "size_ok_message": "SIZE_OK",
-                "complete_message": "FILE_TRANSFER_COMPLETE",
-                "transfer_ok_message": "TRANSFER_OK"
-            },
             "logging": {
                 "level": "INFO",
                 "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
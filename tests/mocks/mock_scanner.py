@@ -109,6 +109,7 @@ def discover_agents_operation():
         except Exception as e:
             logger.error(f"Scanner initialization failed: {e}")
             console.print(f"[bold red]Error:[/bold red] {e}")
+            scanner_service.close()
             return
     
     # Create network info table
@@ -148,6 +149,8 @@ def discover_agents_operation():
     except Exception as e:
         logger.error(f"Scanner operation failed: {e}")
         console.print(f"[bold red]Error:[/bold red] {e}")
+    finally:
+        scanner_service.close()
     
     console.input("\n[dim]Press Enter to return to main menu...[/dim]")
 